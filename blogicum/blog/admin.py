@@ -1,9 +1,10 @@
 from django.contrib import admin
 
-from .models import Post, Location, Category, Comment
+from .models import Post, Location, Category, Comment, Follow
 
 
 admin.site.register(Post)
 admin.site.register(Location)
 admin.site.register(Category)
 admin.site.register(Comment)
+admin.site.register(Follow)
@@ -0,0 +1,151 @@
+"""Read-only JSON API over posts.
+
+Rows come from .values() of the requested fields only, so no model
+instances or templates are involved.
+"""
+from functools import wraps
+
+from django.contrib.auth import get_user_model
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_safe
+
+from .caching import (
+    conditional_page, get_feed_validators, get_post_validators,
+    get_profile_validators
+)
+from .models import Category, Post
+from .paginators import CursorPaginator
+from .storage import post_image_storage
+
+User = get_user_model()
+
+ITEMS_PER_PAGE = 20
+# Public name: lookup of .values().
+FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'updated_at': 'updated_at',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': 'location__name',
+    'image': 'image',
+    'comment_count': 'comment_count',
+}
+# Paginated by these, fetched even if not requested.
+ORDERING_FIELDS = ('pub_date', 'id')
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def get_fields(request):
+    """Return requested field names, all of them by default."""
+    fields = request.GET.get('fields')
+    if not fields:
+        return tuple(FIELDS)
+    fields = tuple(dict.fromkeys(
+        name.strip() for name in fields.split(',') if name.strip()
+    ))
+    unknown = [name for name in fields if name not in FIELDS]
+    if unknown:
+        raise InvalidFields(f'Неизвестные поля: {", ".join(unknown)}.')
+    return fields
+
+
+def get_lookups(fields):
+    return {FIELDS[name] for name in fields} | set(ORDERING_FIELDS)
+
+
+def serialize(row, fields):
+    item = {name: row[FIELDS[name]] for name in fields}
+    if 'image' in item:
+        item['image'] = (
+            post_image_storage.url(item['image']) if item['image'] else None
+        )
+    return item
+
+
+def api_view(view):
+    """Serve GET as JSON with errors in JSON too, gzipped."""
+    @gzip_page
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except InvalidFields as error:
+            return JsonResponse({'detail': str(error)}, status=400)
+        except Http404 as error:
+            return JsonResponse({'detail': str(error)}, status=404)
+    return wrapper
+
+
+def posts_response(request, posts):
+    fields = get_fields(request)
+    page = CursorPaginator(
+        posts.values(*get_lookups(fields)), ITEMS_PER_PAGE
+    ).get_page(request.GET.get('cursor'))
+    return JsonResponse({
+        'results': [serialize(row, fields) for row in page],
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+@api_view
+@conditional_page(
+    lambda request: get_feed_validators(Post.objects.selected(), 'index')
+)
+def posts(request):
+    return posts_response(
+        request, Post.objects.selected(apply_related=False)
+    )
+
+
+@api_view
+@conditional_page(
+    lambda request, category_slug: get_feed_validators(
+        Post.objects.selected().filter(category__slug=category_slug),
+        request.path
+    )
+)
+def category_posts(request, category_slug):
+    category = get_object_or_404(
+        Category, is_published=True, slug=category_slug
+    )
+    return posts_response(
+        request, category.posts.selected(apply_related=False)
+    )
+
+
+@api_view
+@conditional_page(get_profile_validators)
+def profile_posts(request, username):
+    author = get_object_or_404(User, username=username)
+    return posts_response(
+        request,
+        author.posts.selected(
+            apply_published=request.user != author, apply_related=False
+        )
+    )
+
+
+@api_view
+@conditional_page(get_post_validators)
+def post_detail(request, post_id):
+    fields = get_fields(request)
+    row = (
+        Post.objects.selected(apply_published=False, apply_related=False)
+        .visible_to(request.user)
+        .filter(id=post_id)
+        .values(*get_lookups(fields))
+        .first()
+    )
+    if row is None:
+        raise Http404('Публикация не найдена.')
+    return JsonResponse(serialize(row, fields))
@@ -0,0 +1,340 @@
+import hashlib
+import math
+import time
+from datetime import datetime, timezone
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min
+from django.template.loader import render_to_string
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_response_headers
+)
+from django.utils.http import http_date, quote_etag
+from django.utils.safestring import mark_safe
+from django.utils.timezone import now
+
+from .models import Post
+
+VERSION_KEY = 'blog:version:{}:{}'
+POST_CARD_KEY = 'blog:post_card:{}:{}'
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+FEED_GENERATION_KEY = VERSION_KEY.format('feed', 'all')
+# Bumped by posts and their relations only, not by comments or renditions.
+POSTS_GENERATION_KEY = VERSION_KEY.format('feed', 'posts')
+PAGE_KEY = 'blog:page:{}:{}'
+PAGE_QUERY_PARAMS = ('page', 'cursor')
+NEXT_PUBLICATION_KEY = 'blog:next_publication'
+FEED_VALIDATORS_KEY = 'blog:feed_validators:{}:{}'
+POST_VALIDATOR_FIELDS = (
+    'updated_at', 'category__updated_at', 'location__updated_at',
+    'comment_count', 'author_id'
+)
+
+
+def set_version(key):
+    cache.set(key, time.time_ns(), None)
+
+
+def invalidate(callback):
+    """Run callback now and again after the commit.
+
+    The first run serves reads within the transaction. Only the second
+    one keeps a concurrent request from caching the old rows under the
+    new version.
+    """
+    if transaction.get_connection().in_atomic_block:
+        callback()
+    transaction.on_commit(callback)
+
+
+def bump_version(name, pk):
+    """Invalidate every fragment built from the object."""
+    invalidate(partial(set_version, VERSION_KEY.format(name, pk)))
+
+
+def bump_feed_generation():
+    """Invalidate every cached feed page."""
+    invalidate(partial(set_version, FEED_GENERATION_KEY))
+
+
+def bump_posts_generation():
+    """Invalidate feeds showing posts without comments or images."""
+    invalidate(partial(set_version, POSTS_GENERATION_KEY))
+
+
+def get_versions(keys):
+    """Return versions for keys, missing (or evicted) ones get a new one."""
+    versions = cache.get_many(keys)
+    missing = {
+        key: time.time_ns() for key in keys if key not in versions
+    }
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return versions
+
+
+def get_post_card_dependencies(post):
+    return (
+        VERSION_KEY.format('post', post.id),
+        VERSION_KEY.format('category', post.category_id),
+        VERSION_KEY.format('location', post.location_id),
+        VERSION_KEY.format('user', post.author_id),
+    )
+
+
+def render_post_cards(posts):
+    """Render post cards, reusing cached fragments of unchanged posts."""
+    versions = get_versions({
+        key
+        for post in posts
+        for key in get_post_card_dependencies(post)
+    })
+    card_keys = [
+        POST_CARD_KEY.format(post.id, '-'.join(
+            str(versions[key]) for key in get_post_card_dependencies(post)
+        ))
+        for post in posts
+    ]
+    cards = cache.get_many(card_keys)
+    rendered = {
+        key: render_to_string(POST_CARD_TEMPLATE, {'post': post})
+        for key, post in zip(card_keys, posts)
+        if key not in cards
+    }
+    if rendered:
+        cache.set_many(rendered, settings.BLOG_POST_CARD_CACHE_TIMEOUT)
+        cards.update(rendered)
+    return [mark_safe(cards[key]) for key in card_keys]
+
+
+def get_page_key(request):
+    """Key of the page by path and pagination params only."""
+    query = '&'.join(
+        f'{name}={request.GET[name]}'
+        for name in PAGE_QUERY_PARAMS if name in request.GET
+    )
+    generation = get_versions([FEED_GENERATION_KEY])[FEED_GENERATION_KEY]
+    return PAGE_KEY.format(
+        generation,
+        hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+    )
+
+
+def get_next_publication():
+    """Return the nearest future pub_date, tracked in the cache."""
+    current = now()
+    timestamp = cache.get(NEXT_PUBLICATION_KEY)
+    if timestamp is None or 0 < timestamp <= current.timestamp():
+        next_pub_date = Post.objects.filter(
+            is_published=True, pub_date__gt=current
+        ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+        timestamp = next_pub_date.timestamp() if next_pub_date else 0
+        cache.set(
+            NEXT_PUBLICATION_KEY, timestamp, settings.BLOG_PAGE_CACHE_TIMEOUT
+        )
+    if not timestamp:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def reset_next_publication():
+    invalidate(partial(cache.delete, NEXT_PUBLICATION_KEY))
+
+
+def get_cache_timeout(timeout):
+    """Cap timeout so nothing is cached past the next delayed publication."""
+    next_pub_date = get_next_publication()
+    if next_pub_date is None:
+        return timeout
+    return max(0, min(
+        timeout, math.ceil((next_pub_date - now()).total_seconds())
+    ))
+
+
+def cache_anonymous_page(view):
+    """Cache GET responses for anonymous users until the feed changes."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+        ):
+            return view(request, *args, **kwargs)
+        key = get_page_key(request)
+        timeout = get_cache_timeout(settings.BLOG_PAGE_CACHE_TIMEOUT)
+        response = cache.get(key)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            if timeout:
+                cache.set(key, response, timeout)
+        patch_response_headers(response, timeout)
+        return response
+    return wrapper
+
+
+def get_feed_validators(posts, key, generation_key=FEED_GENERATION_KEY):
+    """Return (version, last modified timestamp) of a feed of the posts.
+
+    The generation covers every edit shown in the feed, the newest post
+    covers delayed publications becoming visible. The result is cached
+    under the key until either changes, otherwise it costs one indexed
+    query. Feeds without comments or images pass POSTS_GENERATION_KEY.
+    """
+    generation = get_versions([generation_key])[generation_key]
+    cache_key = FEED_VALIDATORS_KEY.format(
+        generation, hashlib.md5(key.encode()).hexdigest()
+    )
+    validators = cache.get(cache_key)
+    if validators is not None:
+        return validators
+    newest = (
+        posts.order_by('-pub_date', '-id')
+        .values_list('id', 'pub_date')
+        .first()
+    )
+    post_id, pub_date = newest or (0, None)
+    last_modified = generation // 10 ** 9
+    if pub_date is not None:
+        last_modified = max(last_modified, int(pub_date.timestamp()))
+    validators = (f'{generation}-{post_id}', last_modified)
+    cache.set(
+        cache_key, validators,
+        get_cache_timeout(settings.BLOG_PAGE_CACHE_TIMEOUT)
+    )
+    return validators
+
+
+def get_profile_validators(request, username):
+    """Probe the profile feed, the author also sees own hidden posts.
+
+    The follow button depends on the subscriptions of the visitor, they
+    bump the following version, see blog.signals.bump_following_version.
+    """
+    is_author = request.user.get_username() == username
+    version, last_modified = get_feed_validators(
+        Post.objects.selected(apply_published=not is_author)
+        .filter(author__username=username),
+        f'{request.path}:{is_author}'
+    )
+    if not request.user.is_authenticated:
+        return version, last_modified
+    key = VERSION_KEY.format('following', request.user.id)
+    following = get_versions([key])[key]
+    return (
+        f'{version}-{following}', max(last_modified, following // 10 ** 9)
+    )
+
+
+def make_post_validators(post_id, row):
+    """Return validators of post_detail from the POST_VALIDATOR_FIELDS row.
+
+    Saving or deleting a comment bumps the post version, so comment dates
+    are not needed.
+    """
+    *timestamps, comment_count, author_id = row
+    keys = (VERSION_KEY.format('post', post_id),
+            VERSION_KEY.format('user', author_id))
+    versions = get_versions(keys)
+    last_modified = max(
+        [int(timestamp.timestamp()) for timestamp in timestamps if timestamp]
+        + [versions[key] // 10 ** 9 for key in keys]
+    )
+    return (
+        '-'.join(map(str, (*row, *(versions[key] for key in keys)))),
+        last_modified
+    )
+
+
+def get_post_validators(request, post_id):
+    """Probe the post and its relations for post_detail."""
+    row = (
+        Post.objects.visible_to(request.user)
+        .filter(id=post_id)
+        .values_list(*POST_VALIDATOR_FIELDS)
+        .first()
+    )
+    if row is None:
+        return None
+    return make_post_validators(post_id, row)
+
+
+def get_loaded_post_validators(post):
+    """Validators of post_detail from the post with selected relations."""
+    return make_post_validators(post.id, (
+        post.updated_at,
+        post.category.updated_at if post.category else None,
+        post.location.updated_at if post.location else None,
+        post.comment_count,
+        post.author_id,
+    ))
+
+
+def get_page_etag(request, version):
+    """Return the ETag of the page version seen by this visitor.
+
+    Pages differ per user and embed the CSRF token, both go in the tag.
+    """
+    visitor = (
+        request.get_full_path(),
+        request.user.id,
+        request.META.get('CSRF_COOKIE'),
+    )
+    return quote_etag(hashlib.md5(
+        '|'.join(map(str, (*visitor, version))).encode()
+    ).hexdigest())
+
+
+def set_page_validators(request, response, validators):
+    """Add ETag and Last-Modified of the page version to the response.
+
+    Pages not cached by cache_anonymous_page are private and revalidated.
+    """
+    version, last_modified = validators
+    response['ETag'] = get_page_etag(request, version)
+    response['Last-Modified'] = http_date(last_modified)
+    if 'Cache-Control' not in response:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_page(get_validators, probe_conditional_only=False):
+    """Answer revalidation with 304 before the view queries or renders.
+
+    The get_validators(request, *args, **kwargs) cheap probe returns
+    (version, last modified timestamp), or None to leave it to the view.
+    With probe_conditional_only the probe is skipped for requests without
+    If-None-Match and If-Modified-Since, the view then sets validators of
+    what it loaded with set_page_validators. Responses without caching
+    headers of cache_anonymous_page must be revalidated and stay private,
+    see set_page_validators.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            validators = None
+            if request.method in ('GET', 'HEAD') and (
+                not probe_conditional_only
+                or 'HTTP_IF_NONE_MATCH' in request.META
+                or 'HTTP_IF_MODIFIED_SINCE' in request.META
+            ):
+                validators = get_validators(request, *args, **kwargs)
+            if validators is None:
+                return view(request, *args, **kwargs)
+            response = get_conditional_response(
+                request, etag=get_page_etag(request, validators[0]),
+                last_modified=validators[1]
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            # Rendering may have issued the first CSRF cookie.
+            return set_page_validators(request, response, validators)
+        return wrapper
+    return decorator
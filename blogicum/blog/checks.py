@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backends keeping entries in the memory of one process, or nowhere.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Cache invalidation by version keys needs a cache shared by workers."""
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        f'Кеш {backend} не общий для процессов приложения: после'
+        ' изменений другие процессы будут отдавать устаревшие страницы.',
+        hint='Укажите в CACHES FileBasedCache, Redis или Memcached.',
+        id='blog.W001',
+    )]
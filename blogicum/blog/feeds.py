@@ -0,0 +1,148 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_response_headers
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date, quote_etag
+
+from .caching import (
+    POSTS_GENERATION_KEY, get_cache_timeout, get_feed_validators
+)
+from .models import Category, Post
+
+User = get_user_model()
+
+FEED_ITEMS = 20
+FEED_KEY = 'blog:feed:{}:{}'
+
+
+class PostsFeed(Feed):
+    """RSS of the latest posts, mirrors the index page.
+
+    Validators come from the newest visible post and the posts generation,
+    see get_feed_validators, so a 304 costs one indexed query and the
+    cached body is reused until a post or its relation changes. Comments
+    and image renditions are not in the feed and leave it cached.
+    """
+
+    title = 'Блогикум'
+    description = 'Новые публикации'
+
+    def get_object(self, request, *args, **kwargs):
+        return None
+
+    def get_posts(self, obj):
+        return Post.objects.selected()
+
+    def link(self, obj):
+        return reverse('blog:index')
+
+    def items(self, obj):
+        return self.get_posts(obj)[:FEED_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=(post.id,))
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_author_name(self, post):
+        return post.author.get_username()
+
+    def item_categories(self, post):
+        return (post.category.title,) if post.category else ()
+
+    def __call__(self, request, *args, **kwargs):
+        obj = self.get_object(request, *args, **kwargs)
+        version, last_modified = get_feed_validators(
+            self.get_posts(obj), request.path, POSTS_GENERATION_KEY
+        )
+        etag = quote_etag(version)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            key = FEED_KEY.format(
+                hashlib.md5(request.path.encode()).hexdigest(), etag
+            )
+            content = cache.get(key)
+            if content is None:
+                feedgen = self.get_feed(obj, request)
+                content = feedgen.writeString('utf-8')
+                cache.set(key, content, settings.BLOG_PAGE_CACHE_TIMEOUT)
+            response = HttpResponse(
+                content, content_type=self.feed_type.content_type
+            )
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_response_headers(
+            response, get_cache_timeout(settings.BLOG_PAGE_CACHE_TIMEOUT)
+        )
+        return response
+
+
+class CategoryPostsFeed(PostsFeed):
+    """RSS of the category, mirrors the category page."""
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, is_published=True, slug=category_slug
+        )
+
+    def get_posts(self, category):
+        return category.posts.selected()
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=(category.slug,))
+
+
+class ProfilePostsFeed(PostsFeed):
+    """RSS of the author, mirrors published posts of the profile page."""
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, author):
+        return author.posts.selected()
+
+    def title(self, author):
+        return f'Блогикум: {author.get_username()}'
+
+    def description(self, author):
+        return f'Публикации пользователя {author.get_username()}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=(author.get_username(),))
+
+
+class AtomPostsFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class AtomCategoryPostsFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = CategoryPostsFeed.description
+
+
+class AtomProfilePostsFeed(ProfilePostsFeed):
+    feed_type = Atom1Feed
+    subtitle = ProfilePostsFeed.description
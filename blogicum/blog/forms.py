@@ -1,5 +1,12 @@
 from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from django.db import transaction
+from django.template.defaultfilters import filesizeformat
+from PIL import Image
 
+from .images import normalize_image, schedule_renditions
 from .models import Post, Comment
 
 
@@ -8,6 +15,34 @@ class PostForm(forms.ModelForm):
         model = Post
         exclude = ('author', )
 
+    def clean_image(self):
+        image = self.cleaned_data.get('image')
+        if not isinstance(image, UploadedFile):
+            return image
+        if image.size > settings.BLOG_IMAGE_MAX_UPLOAD_SIZE:
+            raise ValidationError(
+                'Размер фото не должен превышать '
+                f'{filesizeformat(settings.BLOG_IMAGE_MAX_UPLOAD_SIZE)}.'
+            )
+        try:
+            return normalize_image(image, settings.BLOG_IMAGE_MAX_DIMENSION)
+        except (
+            OSError, ValueError, Image.DecompressionBombError,
+            Image.DecompressionBombWarning
+        ):
+            raise ValidationError('Не удалось обработать фото.')
+
+    def save(self, commit=True):
+        image_changed = 'image' in self.changed_data
+        if image_changed:
+            self.instance.image_renditions = ''
+        post = super().save(commit)
+        if commit and image_changed and post.image:
+            transaction.on_commit(
+                lambda: schedule_renditions(post.id, post.image.name)
+            )
+        return post
+
 
 class CommentForm(forms.ModelForm):
     class Meta:
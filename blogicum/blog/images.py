@@ -0,0 +1,229 @@
+import logging
+import posixpath
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import UploadedFile
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+from .caching import bump_feed_generation, bump_version
+from .models import ImageLock, Post
+from .storage import post_image_storage
+
+RENDITION_WIDTHS = (320, 640, 1280)
+RENDITION_FORMATS = {
+    'webp': ('WEBP', 'webp', 80),
+    'jpeg': ('JPEG', 'jpg', 82),
+}
+RENDITIONS_DIR = 'renditions'
+UPLOAD_FORMATS = {
+    'JPEG': 'image/jpeg',
+    'PNG': 'image/png',
+    'WEBP': 'image/webp',
+    'GIF': 'image/gif',
+}
+UPLOAD_QUALITY = 85
+# Modes the PNG encoder writes as is.
+PNG_MODES = ('1', 'L', 'LA', 'I', 'I;16', 'P', 'RGB', 'RGBA')
+# Info needed to render the image, everything else is metadata.
+RENDER_INFO = (
+    'transparency', 'background', 'duration', 'loop', 'icc_profile'
+)
+SPOOL_SIZE = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_rendition_name(name, width, image_format):
+    directory, basename = posixpath.split(name)
+    extension = RENDITION_FORMATS[image_format][1]
+    return posixpath.join(
+        directory, RENDITIONS_DIR, f'{basename}_{width}.{extension}'
+    )
+
+
+def get_renditions(post, image_format):
+    """Return [(url, width)] of ready renditions of the post image."""
+    if not post.image or not post.image_renditions:
+        return []
+    return [
+        (post_image_storage.url(
+            get_rendition_name(post.image.name, int(width), image_format)
+        ), int(width))
+        for width in post.image_renditions.split(',')
+    ]
+
+
+def normalize_image(file, max_dimension):
+    """Decode the upload, drop metadata, downscale and re-encode it.
+
+    JPEG is decoded already reduced with draft(), the result is spooled
+    to disk when large. Encoders like PNG write EXIF back from the info,
+    so only what rendering needs is kept there. Images over
+    Image.MAX_IMAGE_PIXELS raise Image.DecompressionBombWarning, not only
+    those twice as large.
+    """
+    file.seek(0)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', Image.DecompressionBombWarning)
+        image = Image.open(file)
+        image_format = image.format
+        if image_format == 'JPEG':
+            image.draft('RGB', (max_dimension, max_dimension))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(
+            (max_dimension, max_dimension), Image.Resampling.LANCZOS
+        )
+    name = file.name
+    if image_format not in UPLOAD_FORMATS:
+        image_format = 'PNG'
+        name = f'{posixpath.splitext(name)[0]}.png'
+        if image.mode not in PNG_MODES:
+            image = image.convert(
+                'RGBA' if 'A' in image.getbands() else 'RGB'
+            )
+    image.info = {
+        key: value for key, value in image.info.items()
+        if key in RENDER_INFO
+    }
+    output = SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    # JPEG and WEBP encoders take the profile only as an argument.
+    image.save(
+        output, image_format, quality=UPLOAD_QUALITY, optimize=True,
+        icc_profile=image.info.get('icc_profile')
+    )
+    size = output.tell()
+    output.seek(0)
+    return UploadedFile(
+        output, name, content_type=UPLOAD_FORMATS[image_format], size=size
+    )
+
+
+def make_renditions(name):
+    """Save resized copies of the image in every format, return widths."""
+    with post_image_storage.open(name) as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image = image.convert(
+            'RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB'
+        )
+    widths = [width for width in RENDITION_WIDTHS if width < image.width]
+    if image.width <= RENDITION_WIDTHS[-1]:
+        widths.append(image.width)
+    for width in widths:
+        resized = image.resize(
+            (width, max(1, round(image.height * width / image.width))),
+            Image.Resampling.LANCZOS
+        )
+        for image_format, (pil_format, _, quality) in (
+            RENDITION_FORMATS.items()
+        ):
+            if pil_format == 'JPEG':
+                resized = resized.convert('RGB')
+            buffer = BytesIO()
+            resized.save(
+                buffer, pil_format, quality=quality, optimize=True,
+                icc_profile=image.info.get('icc_profile')
+            )
+            rendition_name = get_rendition_name(name, width, image_format)
+            post_image_storage.save_derived(
+                rendition_name, ContentFile(buffer.getvalue())
+            )
+    return widths
+
+
+@contextmanager
+def lock_image(name):
+    """Serialize claiming and releasing of the shared image file.
+
+    The row is locked with SELECT FOR UPDATE. SQLite ignores it but lets
+    one writer at a time, so the leading UPDATE takes the database write
+    lock until commit. The row is removed on exit and never piles up.
+    """
+    with transaction.atomic():
+        ImageLock.objects.filter(name=name).update(name=name)
+        ImageLock.objects.select_for_update().get_or_create(name=name)
+        yield
+        ImageLock.objects.filter(name=name).delete()
+
+
+def release_image(name, renditions):
+    """Delete the image and its renditions if no post references it."""
+    with lock_image(name):
+        if Post.objects.filter(image=name).exists():
+            return
+        post_image_storage.delete(name)
+        for width in filter(None, renditions.split(',')):
+            for image_format in RENDITION_FORMATS:
+                post_image_storage.delete(
+                    get_rendition_name(name, int(width), image_format)
+                )
+
+
+def claim_image(name, content):
+    """Write the image back if it was released before the post committed.
+
+    Saving a content already stored writes nothing, so a concurrent
+    release_image may delete the file between the save and the commit of
+    the post referencing it. Runs on commit of that post.
+    """
+    with lock_image(name):
+        post_image_storage.restore(name, content)
+
+
+def save_renditions(post_id, name, widths):
+    # The image may have been replaced while renditions were made.
+    Post.objects.filter(id=post_id, image=name).update(
+        image_renditions=','.join(map(str, widths))
+    )
+    bump_version('post', post_id)
+    bump_feed_generation()
+
+
+def on_renditions_done(post_id, name, future):
+    """Store the result in the main process, callback thread."""
+    try:
+        save_renditions(post_id, name, future.result())
+    except Exception:
+        logger.exception('Не удалось создать миниатюры %s', name)
+    finally:
+        connections.close_all()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.BLOG_IMAGE_WORKERS,
+            initializer=django.setup
+        )
+    return _executor
+
+
+def schedule_renditions(post_id, name):
+    """Make renditions in the worker pool, inline if it is disabled."""
+    # Content-addressed images may already have renditions from a twin.
+    renditions = Post.objects.filter(image=name).exclude(
+        image_renditions=''
+    ).values_list('image_renditions', flat=True).first()
+    if renditions:
+        save_renditions(post_id, name, renditions.split(','))
+        return
+    if not settings.BLOG_IMAGE_WORKERS:
+        try:
+            save_renditions(post_id, name, make_renditions(name))
+        except Exception:
+            logger.exception('Не удалось создать миниатюры %s', name)
+        return
+    get_executor().submit(make_renditions, name).add_done_callback(
+        partial(on_renditions_done, post_id, name)
+    )
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.models import Follow
+from blog.timelines import BATCH_SIZE, backfill
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет ленты подписок последними публикациями авторов,'
+        ' например после пакетной загрузки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=settings.BLOG_TIMELINE_BACKFILL,
+            help='Сколько последних публикаций автора добавить в ленту.'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, limit, batch_size, **options):
+        created = 0
+        last_id = 0
+        while True:
+            follows = list(
+                Follow.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', 'user_id', 'author_id')[:batch_size]
+            )
+            if not follows:
+                break
+            last_id = follows[-1][0]
+            for _, user_id, author_id in follows:
+                created += backfill(user_id, author_id, limit)
+        self.stdout.write(
+            self.style.SUCCESS(f'Добавлено записей лент: {created}')
+        )
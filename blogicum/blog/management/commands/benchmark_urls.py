@@ -0,0 +1,162 @@
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import F
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog import urls as blog_urls
+from blog.models import Category, Comment
+from pages import urls as pages_urls
+
+BASELINE_PATH = settings.BASE_DIR / 'benchmarks' / 'baseline.json'
+ITERATIONS = 50
+TOLERANCE = 0.2
+# POST-only routes changing state, GET would only measure 405.
+SKIPPED_ROUTES = ('blog:follow', 'blog:unfollow')
+# Suffix of results of the anonymous visitor, served from the page cache.
+ANONYMOUS = '@anonymous'
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def get_route_kwargs():
+    """Pick objects for route params: own post with own comment."""
+    comment = (
+        Comment.objects.select_related('post', 'author')
+        .filter(author=F('post__author'))
+        .order_by('-id')
+        .first()
+    ) or Comment.objects.select_related('post', 'author').order_by('-id')[0]
+    category = Category.objects.filter(is_published=True).first()
+    return comment.author, {
+        'post_id': comment.post_id,
+        'comment_id': comment.id,
+        'category_slug': category.slug,
+        'username': comment.author.username,
+    }
+
+
+def get_routes(kwargs):
+    """Return {name: url} for every named route of blog and pages."""
+    routes = {}
+    for module in (blog_urls, pages_urls):
+        for pattern in module.urlpatterns:
+            name = f'{module.app_name}:{pattern.name}'
+            if name in SKIPPED_ROUTES:
+                continue
+            routes[name] = reverse(name, kwargs={
+                param: kwargs[param] for param in pattern.pattern.converters
+            })
+    return routes
+
+
+def measure(client, url, iterations):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    # Every request resets the query log, count before the next one.
+    query_count = len(queries)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        client.get(url)
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'status': response.status_code,
+        'queries': query_count,
+        'p50_ms': round(statistics.median(timings), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'memory_kb': round(peak / 1024, 1),
+    }
+
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append(
+                f"{name}: запросов {result['queries']}"
+                f" вместо {expected['queries']}"
+            )
+        for metric in ('p50_ms', 'p99_ms', 'memory_kb'):
+            if result[metric] > expected[metric] * (1 + tolerance):
+                regressions.append(
+                    f'{name}: {metric} {result[metric]}'
+                    f' вместо {expected[metric]}'
+                )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет число запросов, задержку и память для всех адресов'
+        ' blog и pages и сравнивает их с сохранённым эталоном.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=ITERATIONS)
+        parser.add_argument('--baseline', default=str(BASELINE_PATH))
+        parser.add_argument(
+            '--tolerance', type=float, default=TOLERANCE,
+            help='Допустимый рост задержки и памяти относительно эталона.'
+        )
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help='Сохранить результаты как новый эталон.'
+        )
+
+    def handle(self, *args, iterations, baseline, tolerance, save_baseline,
+               **options):
+        user, kwargs = get_route_kwargs()
+        client = Client(SERVER_NAME=settings.ALLOWED_HOSTS[0])
+        anonymous_client = Client(SERVER_NAME=settings.ALLOWED_HOSTS[0])
+        client.force_login(user)
+        results = {}
+        for name, url in get_routes(kwargs).items():
+            results[name] = measure(client, url, iterations)
+            results[name + ANONYMOUS] = measure(
+                anonymous_client, url, iterations
+            )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<32} {result["status"]} '
+                f'queries={result["queries"]} p50={result["p50_ms"]}ms '
+                f'p99={result["p99_ms"]}ms memory={result["memory_kb"]}KB'
+            )
+        if save_baseline:
+            Path(baseline).parent.mkdir(parents=True, exist_ok=True)
+            with open(baseline, 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2, sort_keys=True)
+            self.stdout.write(
+                self.style.SUCCESS(f'Эталон сохранён: {baseline}')
+            )
+            return
+        try:
+            with open(baseline, encoding='utf-8') as file:
+                regressions = find_regressions(
+                    results, json.load(file), tolerance
+                )
+        except FileNotFoundError:
+            raise CommandError(
+                f'Нет эталона {baseline}, запустите с --save-baseline.'
+            )
+        if regressions:
+            raise CommandError('\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('Регрессий нет.'))
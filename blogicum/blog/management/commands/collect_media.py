@@ -0,0 +1,113 @@
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import timedelta
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+from django.utils import timezone
+
+from blog.images import RENDITIONS_DIR, lock_image
+from blog.models import POST_IMAGE_DIR, Post
+from blog.storage import post_image_storage
+
+# SQLite limits the number of parameters of a query.
+BATCH_SIZE = 500
+WORKERS = 4
+MIN_AGE = 3600
+
+
+def walk(storage, directory):
+    """Yield names of all files under the directory, lazily."""
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield posixpath.join(directory, name)
+    for name in directories:
+        yield from walk(storage, posixpath.join(directory, name))
+
+
+def get_source_name(name):
+    """Return the image name a rendition was made from, else the name."""
+    directory, basename = posixpath.split(name)
+    parent, last = posixpath.split(directory)
+    if last != RENDITIONS_DIR:
+        return name
+    return posixpath.join(parent, basename.rpartition('_')[0])
+
+
+def find_orphans(names, modified_before):
+    """Return names of the batch neither posts nor their images refer to."""
+    sources = {name: get_source_name(name) for name in names}
+    referenced = set(
+        Post.objects.filter(image__in=set(sources.values()))
+        .values_list('image', flat=True)
+    )
+    # Fresh files may belong to a post that is not committed yet.
+    return [
+        name for name, source in sources.items()
+        if source not in referenced
+        and post_image_storage.get_modified_time(name) < modified_before
+    ]
+
+
+def remove(name, dry_run):
+    size = post_image_storage.size(name)
+    if not dry_run:
+        post_image_storage.delete(name)
+    return name, size
+
+
+class Command(BaseCommand):
+    help = (
+        'Находит и удаляет файлы фото публикаций и их миниатюры,'
+        ' на которые не ссылается ни одна публикация.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать найденные файлы, ничего не удалять.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество файлов, проверяемых за один запрос.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=WORKERS,
+            help='Количество потоков удаления.'
+        )
+        parser.add_argument(
+            '--min-age', type=int, default=MIN_AGE,
+            help='Не трогать файлы моложе стольких секунд.'
+        )
+
+    def handle(self, *args, dry_run, batch_size, workers, min_age,
+               verbosity, **options):
+        modified_before = timezone.now() - timedelta(seconds=min_age)
+        count = freed = 0
+        if post_image_storage.exists(POST_IMAGE_DIR):
+            names = walk(post_image_storage, POST_IMAGE_DIR)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for batch in iter(
+                    lambda: list(islice(names, batch_size)), []
+                ):
+                    orphans = find_orphans(batch, modified_before)
+                    with ExitStack() as stack:
+                        for source in sorted(set(map(
+                            get_source_name, orphans
+                        ))):
+                            stack.enter_context(lock_image(source))
+                        # A post may have claimed the file meanwhile.
+                        orphans = find_orphans(orphans, modified_before)
+                        for name, size in executor.map(
+                            remove, orphans, [dry_run] * len(orphans)
+                        ):
+                            if verbosity > 1:
+                                self.stdout.write(name)
+                            count += 1
+                            freed += size
+        action = 'Найдено' if dry_run else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} файлов: {count}, {filesizeformat(freed)}'
+        ))
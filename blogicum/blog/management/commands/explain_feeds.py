@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from blog.models import Category, Post
+from blog.views import ITEMS_PER_PAGE
+
+User = get_user_model()
+
+
+def get_feed_querysets(category=None, author=None):
+    """Return first-page querysets of the feeds, as the views build them."""
+    category = category or Category.objects.first()
+    author = author or User.objects.first()
+    return {
+        'index': Post.objects.selected(),
+        'category_posts': Post.objects.filter(category=category).selected(),
+        'profile_view': Post.objects.filter(author=author).selected(),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Печатает планы запросов лент публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--category', help='Идентификатор категории.')
+        parser.add_argument('--author', help='Имя пользователя автора.')
+
+    def handle(self, *args, category, author, **options):
+        querysets = get_feed_querysets(
+            category=category and Category.objects.get(slug=category),
+            author=author and User.objects.get(username=author),
+        )
+        for name, posts in querysets.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(posts[:ITEMS_PER_PAGE].explain())
@@ -0,0 +1,162 @@
+import csv
+import gzip
+import json
+import os
+import shutil
+import sys
+import zlib
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from blog.models import Comment, Post
+
+CHUNK_SIZE = 2000
+MODELS = {
+    'posts': Post,
+    'comments': Comment,
+}
+
+
+def open_output(path, append, compress):
+    if path == '-':
+        return nullcontext(sys.stdout)
+    mode = 'at' if append else 'wt'
+    if compress or path.endswith('.gz'):
+        # Appending adds a gzip member, readers see one stream.
+        return gzip.open(path, mode, encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def iter_lines(file):
+    """Yield complete lines of a binary file up to a damaged end."""
+    try:
+        for line in file:
+            if not line.endswith(b'\n'):
+                return
+            yield line
+    except (EOFError, zlib.error, gzip.BadGzipFile):
+        return
+
+
+def get_resume_offset(file, after_id, output_format):
+    """Return the size and the last id of complete rows up to after_id."""
+    offset = kept = last_id = 0
+
+    def read():
+        nonlocal offset
+        for line in iter_lines(file):
+            offset += len(line)
+            yield line.decode('utf-8')
+
+    if output_format == 'csv':
+        rows = csv.reader(read())
+        header = next(rows, None)
+        if header is None:
+            return 0, 0
+        kept = offset
+        ids = (int(row[header.index('id')]) for row in rows)
+    else:
+        ids = (json.loads(line)['id'] for line in read())
+    for row_id in ids:
+        if row_id > after_id:
+            break
+        kept, last_id = offset, row_id
+    return kept, last_id
+
+
+def truncate_output(path, after_id, output_format, compress):
+    """Cut a partial last line and rows past after_id before appending.
+
+    An interrupted run leaves them behind, appending after them corrupts
+    the file or duplicates rows. A gzip stream cannot be cut in place, it
+    is rewritten.
+    """
+    if path == '-' or not os.path.exists(path):
+        return
+    compressed = compress or path.endswith('.gz')
+    with (gzip.open if compressed else open)(path, 'rb') as file:
+        size, last_id = get_resume_offset(file, after_id, output_format)
+    if last_id < after_id:
+        raise CommandError(
+            f'В файле {path} целые строки есть только до id {last_id},'
+            f' продолжите выгрузку с --after-id {last_id}.'
+        )
+    if not compressed:
+        with open(path, 'r+b') as file:
+            file.truncate(size)
+        return
+    remaining = size
+    with gzip.open(path, 'rb') as source, gzip.open(
+        f'{path}.tmp', 'wb'
+    ) as target:
+        while remaining:
+            data = source.read(min(remaining, shutil.COPY_BUFSIZE))
+            target.write(data)
+            remaining -= len(data)
+    os.replace(f'{path}.tmp', path)
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает публикации или комментарии в JSON Lines или CSV'
+        ' в порядке id, с возможностью продолжить с последнего id.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=MODELS)
+        parser.add_argument(
+            '--output', default='-',
+            help='Файл выгрузки, по умолчанию stdout; .gz сжимается.'
+        )
+        parser.add_argument(
+            '--format', choices=('jsonl', 'csv'), default='jsonl',
+            dest='output_format'
+        )
+        parser.add_argument('--gzip', action='store_true', dest='compress')
+        parser.add_argument(
+            '--after-id', type=int, default=0,
+            help='Продолжить выгрузку после этого id, дописывая в файл.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, model, output, output_format, compress, after_id,
+               chunk_size, **options):
+        model = MODELS[model]
+        fields = [field.attname for field in model._meta.concrete_fields]
+        rows = (
+            model.objects.filter(id__gt=after_id)
+            .order_by('id')
+            .values(*fields)
+            .iterator(chunk_size=chunk_size)
+        )
+        last_id = after_id
+        exported = 0
+        if after_id:
+            truncate_output(output, after_id, output_format, compress)
+        with open_output(output, bool(after_id), compress) as file:
+            if output_format == 'csv':
+                writer = csv.DictWriter(file, fieldnames=fields)
+                if not after_id:
+                    writer.writeheader()
+                write = writer.writerow
+            else:
+                def write(row):
+                    file.write(json.dumps(
+                        row, cls=DjangoJSONEncoder, ensure_ascii=False
+                    ) + '\n')
+            for row in rows:
+                write(row)
+                last_id = row['id']
+                exported += 1
+                if not exported % chunk_size:
+                    # Everything up to the reported id is on disk.
+                    file.flush()
+                    self.report(exported, last_id)
+        self.report(exported, last_id)
+
+    def report(self, exported, last_id):
+        self.stderr.write(
+            f'Выгружено: {exported}, последний id: {last_id}'
+        )
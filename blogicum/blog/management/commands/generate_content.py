@@ -0,0 +1,103 @@
+import random
+from itertools import count
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils.timezone import now
+from mixer.backend.django import Mixer
+
+from blog.models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+PUB_DATE_SPREAD = timedelta(days=365 * 3)
+
+
+class Command(BaseCommand):
+    help = 'Наполняет базу случайными публикациями для нагрузочных тестов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--categories', type=int, default=50)
+        parser.add_argument('--locations', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=1_000_000)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Начальное значение генератора для воспроизводимости.'
+        )
+
+    def create(self, model, total, **values):
+        """Create objects in batches, return their ids."""
+        mixer = self.mixer
+        offset = model.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        ids = []
+        for start in range(0, total, self.batch_size):
+            size = min(self.batch_size, total - start)
+            objects = mixer.cycle(size).blend(model, **{
+                name: value(offset + start) if callable(value) else value
+                for name, value in values.items()
+            })
+            with transaction.atomic():
+                model.objects.bulk_create(objects)
+            ids.extend(
+                model.objects.order_by('-id')
+                .values_list('id', flat=True)[:size][::-1]
+            )
+            self.stdout.write(f'{model.__name__}: {start + size}/{total}')
+        return ids
+
+    def handle(self, *args, **options):
+        # Mixer draws values from its own Faker generator.
+        random.seed(options['seed'])
+        self.mixer = Mixer(commit=False)
+        self.mixer.faker.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        current = now()
+
+        user_ids = self.create(
+            User, options['users'],
+            username=lambda offset: Mixer.sequence(
+                lambda n: f'user_{offset + n}'
+            ),
+            password='!',
+        )
+        category_ids = self.create(
+            Category, options['categories'],
+            slug=lambda offset: Mixer.sequence(
+                lambda n: f'category-{offset + n}'
+            ),
+            is_published=True,
+        )
+        location_ids = self.create(
+            Location, options['locations'], is_published=True
+        )
+
+        def random_ids(ids):
+            return lambda offset: (random.choice(ids) for _ in count())
+
+        post_ids = self.create(
+            Post, options['posts'],
+            author_id=random_ids(user_ids),
+            category_id=random_ids(category_ids),
+            location_id=random_ids(location_ids),
+            pub_date=lambda offset: (
+                current - PUB_DATE_SPREAD * random.random()
+                for _ in count()
+            ),
+            is_published=True,
+            image='',
+        )
+        self.create(
+            Comment, options['comments'],
+            author_id=random_ids(user_ids),
+            post_id=random_ids(post_ids),
+        )
+        call_command('recount_comments', stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
@@ -0,0 +1,108 @@
+import json
+import sys
+from collections import Counter
+from contextlib import nullcontext
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from blog.caching import bump_feed_generation, bump_version
+from blog.forms import CommentForm
+from blog.models import Comment, Post
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает комментарии из JSON Lines: по объекту'
+        ' {"post": id, "author": id, "text": "..."} в строке.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Файл с комментариями, по умолчанию stdin.'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def parse(self, line_number, line):
+        """Return unsaved comment or None, reporting errors."""
+        try:
+            data = json.loads(line)
+            post_id, author_id = int(data['post']), int(data['author'])
+        except (ValueError, TypeError, KeyError) as error:
+            self.stderr.write(f'{line_number}: {type(error).__name__} {error}')
+            return None
+        form = CommentForm(data)
+        if not form.is_valid():
+            self.stderr.write(f'{line_number}: {form.errors.as_json()}')
+            return None
+        comment = form.save(commit=False)
+        comment.post_id = post_id
+        comment.author_id = author_id
+        comment.line_number = line_number
+        return comment
+
+    def save_batch(self, comments):
+        """Insert comments with existing posts and authors, return count."""
+        post_ids = set(Post.objects.filter(
+            id__in={comment.post_id for comment in comments}
+        ).values_list('id', flat=True))
+        author_ids = set(User.objects.filter(
+            id__in={comment.author_id for comment in comments}
+        ).values_list('id', flat=True))
+        valid = []
+        for comment in comments:
+            if comment.post_id not in post_ids:
+                self.stderr.write(
+                    f'{comment.line_number}: нет публикации {comment.post_id}'
+                )
+            elif comment.author_id not in author_ids:
+                self.stderr.write(
+                    f'{comment.line_number}: нет автора {comment.author_id}'
+                )
+            else:
+                valid.append(comment)
+        # bulk_create skips signals, so counters are updated here.
+        increments = Counter(comment.post_id for comment in valid)
+        by_increment = {}
+        for post_id, increment in increments.items():
+            by_increment.setdefault(increment, []).append(post_id)
+        with transaction.atomic():
+            Comment.objects.bulk_create(valid)
+            for increment, ids in by_increment.items():
+                Post.objects.filter(id__in=ids).update(
+                    comment_count=F('comment_count') + increment
+                )
+        for post_id in increments:
+            bump_version('post', post_id)
+        return len(valid)
+
+    def handle(self, *args, path, batch_size, **options):
+        imported = 0
+        batch = []
+        with (
+            nullcontext(sys.stdin) if path == '-'
+            else open(path, encoding='utf-8')
+        ) as file:
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                comment = self.parse(line_number, line)
+                if comment is not None:
+                    batch.append(comment)
+                if len(batch) >= batch_size:
+                    imported += self.save_batch(batch)
+                    batch = []
+            if batch:
+                imported += self.save_batch(batch)
+        if imported:
+            bump_feed_generation()
+        self.stdout.write(
+            self.style.SUCCESS(f'Загружено комментариев: {imported}')
+        )
@@ -0,0 +1,151 @@
+import gzip
+import json
+import re
+from collections import Counter
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers.base import DeserializationError
+from django.db import IntegrityError, connection, transaction
+
+from blog.caching import (
+    bump_feed_generation, bump_posts_generation, reset_next_publication
+)
+
+BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
+# A malformed file would otherwise be buffered whole looking for an item end.
+MAX_BUFFER = 16 * 1024 * 1024
+SEPARATORS = re.compile(r'[\s,]*')
+# Models in dependency order: a batch is flushed after its dependencies.
+# Rows may still refer to parents later in the file, so foreign keys are
+# checked once the whole file is loaded.
+MODELS = ('auth.user', 'blog.category', 'blog.location', 'blog.post',
+          'blog.comment')
+
+
+def read_array_start(file, chunk_size):
+    """Return the text after the opening bracket of the array."""
+    buffer = ''
+    while not buffer:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        buffer = chunk.lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('Ожидается JSON-массив объектов.')
+    return buffer[1:]
+
+
+def iter_json_array(file, chunk_size=CHUNK_SIZE, max_buffer=MAX_BUFFER):
+    """Yield objects of a top-level JSON array without reading it whole."""
+    decoder = json.JSONDecoder()
+    buffer = read_array_start(file, chunk_size)
+    position = 0
+    eof = False
+    while True:
+        position = SEPARATORS.match(buffer, position).end()
+        if buffer.startswith(']', position):
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise ValueError('Неожиданный конец файла.')
+            if len(buffer) - position > max_buffer:
+                raise ValueError(
+                    f'Некорректный JSON или объект длиннее {max_buffer}'
+                    ' символов.'
+                )
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+        else:
+            if not isinstance(item, dict):
+                raise ValueError(f'Ожидается объект, получено: {item!r:.50}')
+            yield item
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает фикстуру в формате dumpdata (например, db.json)'
+        ' для пользователей и моделей blog пакетными вставками.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSON-файл, можно сжатый gzip.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def flush(self, label):
+        """Insert the pending batch of the model after its dependencies."""
+        for dependency in MODELS[:MODELS.index(label)]:
+            if self.batches[dependency]:
+                self.flush(dependency)
+        batch, self.batches[label] = self.batches[label], []
+        type(batch[0].object).objects.bulk_create(
+            [item.object for item in batch]
+        )
+        for item in batch:
+            for name, values in item.m2m_data.items():
+                if values:
+                    getattr(item.object, name).set(values)
+        self.loaded[label] += len(batch)
+
+    def read(self, file, batch_size):
+        """Collect objects into per-model batches, flushing full ones."""
+        for data in iter_json_array(file):
+            label = data.get('model')
+            if not isinstance(label, str):
+                raise ValueError(f'Нет поля model у объекта {data!r:.50}')
+            label = label.lower()
+            if label not in self.batches:
+                self.skipped[label] += 1
+                continue
+            self.batches[label].extend(
+                serializers.deserialize('python', [data])
+            )
+            if len(self.batches[label]) >= batch_size:
+                self.flush(label)
+        for label in MODELS:
+            if self.batches[label]:
+                self.flush(label)
+
+    def handle(self, *args, path, batch_size, **options):
+        self.batches = {label: [] for label in MODELS}
+        self.loaded = Counter()
+        self.skipped = Counter()
+        open_file = gzip.open if path.endswith('.gz') else open
+        try:
+            with transaction.atomic():
+                with connection.constraint_checks_disabled(), \
+                        open_file(path, 'rt', encoding='utf-8') as file:
+                    self.read(file, batch_size)
+                connection.check_constraints(table_names=[
+                    apps.get_model(label)._meta.db_table
+                    for label in MODELS if self.loaded[label]
+                ])
+        except (OSError, ValueError, DeserializationError) as error:
+            raise CommandError(f'Ошибка чтения {path}: {error}')
+        except IntegrityError as error:
+            raise CommandError(f'Нарушена целостность {path}: {error}')
+
+        models = [
+            apps.get_model(label) for label in MODELS if self.loaded[label]
+        ]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+        if self.loaded['blog.comment']:
+            call_command('recount_comments', stdout=self.stdout)
+        if self.loaded['blog.post']:
+            call_command('rebuild_search_index', stdout=self.stdout)
+        bump_feed_generation()
+        bump_posts_generation()
+        reset_next_publication()
+        for label in MODELS:
+            self.stdout.write(f'{label}: {self.loaded[label]}')
+        for label, count in self.skipped.items():
+            self.stdout.write(f'{label}: пропущено {count}')
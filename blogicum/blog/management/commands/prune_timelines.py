@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.models import TimelineEntry
+from blog.timelines import BATCH_SIZE, prune_orphans, trim
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет из лент записи авторов, от которых отписались,'
+        ' и обрезает ленты до заданной длины.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep', type=int, default=settings.BLOG_TIMELINE_MAX_ENTRIES,
+            help='Сколько последних записей оставить в каждой ленте.'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, keep, batch_size, **options):
+        orphans = prune_orphans(batch_size)
+        trimmed = 0
+        last_id = 0
+        while True:
+            # Not an iterator: SQLite cursors see deletes of the table.
+            user_ids = list(
+                TimelineEntry.objects.filter(user_id__gt=last_id)
+                .order_by('user_id')
+                .values_list('user_id', flat=True)
+                .distinct()[:batch_size]
+            )
+            if not user_ids:
+                break
+            last_id = user_ids[-1]
+            for user_id in user_ids:
+                trimmed += trim(user_id, keep)
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено записей без подписки: {orphans}, старых: {trimmed}'
+        ))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog.search import BATCH_SIZE, get_search_backend
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает поисковый индекс публикаций, например после'
+        ' пакетной загрузки.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, batch_size, **options):
+        indexed = get_search_backend().rebuild(batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано публикаций: {indexed}')
+        )
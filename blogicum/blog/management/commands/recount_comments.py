@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from blog.caching import bump_feed_generation, bump_version
+from blog.models import Comment, Post
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённое количество комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество публикаций, проверяемых за один запрос.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        fixed = 0
+        last_id = 0
+        while True:
+            ids = list(
+                Post.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            with transaction.atomic():
+                # FOR UPDATE cannot be combined with GROUP BY, so the rows
+                # are locked first and counted separately.
+                stored = dict(
+                    Post.objects.filter(id__in=ids)
+                    .select_for_update()
+                    .values_list('id', 'comment_count')
+                )
+                actual = dict(
+                    Comment.objects.filter(post_id__in=ids)
+                    .order_by()
+                    .values_list('post_id')
+                    .annotate(count=Count('id'))
+                )
+                for post_id, comment_count in stored.items():
+                    actual_count = actual.get(post_id, 0)
+                    if comment_count == actual_count:
+                        continue
+                    Post.objects.filter(id=post_id).update(
+                        comment_count=actual_count
+                    )
+                    bump_version('post', post_id)
+                    fixed += 1
+        if fixed:
+            bump_feed_generation()
+        self.stdout.write(
+            self.style.SUCCESS(f'Исправлено счётчиков: {fixed}')
+        )
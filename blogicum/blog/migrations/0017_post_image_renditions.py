@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_comment_post_created_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_renditions',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64, verbose_name='Ширины миниатюр фото'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_updated_at(apps, schema_editor):
+    for name in ('Category', 'Location', 'Post', 'Comment'):
+        apps.get_model('blog', name).objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0020_follow_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name=name,
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        )
+        for name in ('category', 'location', 'post', 'comment')
+    ] + [
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0021_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Имя файла')),
+            ],
+            options={
+                'verbose_name': 'блокировка фото',
+                'verbose_name_plural': 'Блокировки фото',
+            },
+        ),
+    ]
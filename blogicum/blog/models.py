@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from django.db import models
 
 from .querysets import PostQuerySet
+from .storage import post_image_storage
 
 POST_IMAGE_DIR = 'posts'
 TRUNCATE_TEXT_LENGTH = 30
@@ -14,6 +15,10 @@ class PublishableModel(models.Model):
         auto_now_add=True,
         verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
     is_published = models.BooleanField(
         default=True,
         verbose_name='Опубликовано',
@@ -87,25 +92,76 @@ class Post(PublishableModel):
         null=True,
         verbose_name='Категория'
     )
-    image = models.ImageField('Фото', blank=True, upload_to=POST_IMAGE_DIR)
+    image = models.ImageField(
+        'Фото',
+        blank=True,
+        upload_to=POST_IMAGE_DIR,
+        storage=post_image_storage,
+        db_index=True
+    )
+    image_renditions = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        editable=False,
+        verbose_name='Ширины миниатюр фото'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
 
     objects = PostQuerySet().as_manager()
 
     class Meta:
         default_related_name = 'posts'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                condition=models.Q(is_published=True),
+                name='post_published_pub_date_idx'
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_pub_date_idx'
+            ),
+        )
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
     def __str__(self):
         return self.title[:TRUNCATE_TEXT_LENGTH]
 
+    def save(self, *args, **kwargs):
+        # comment_count is maintained by signals with F() updates,
+        # a stale instance must not overwrite it.
+        if (
+            not self._state.adding
+            and self.pk is not None
+            and kwargs.get('update_fields') is None
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'comment_count'
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Добавлено'
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Изменено'
+    )
     text = models.TextField(verbose_name='Комментарий')
     post = models.ForeignKey(
         Post,
@@ -121,8 +177,108 @@ class Comment(models.Model):
     class Meta:
         default_related_name = 'comments'
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_at_idx'
+            ),
+        )
         verbose_name = 'комментарий'
         verbose_name_plural = 'комментарии'
 
     def __str__(self):
         return self.title[:TRUNCATE_TEXT_LENGTH]
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='Подписчик'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='followers',
+        verbose_name='Автор'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'),
+                name='follow_unique_user_author'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('author')),
+                name='follow_not_self'
+            ),
+        )
+        verbose_name = 'подписка'
+        verbose_name_plural = 'Подписки'
+
+    def __str__(self):
+        return f'{self.user} → {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """Post of a followed author materialized into the user timeline.
+
+    Kept by blog.timelines, pub_date is copied from the post so the
+    timeline is read by the (user, pub_date) index alone.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        verbose_name='Читатель'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        verbose_name='Публикация'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата и время публикации')
+
+    class Meta:
+        default_related_name = 'timeline_entries'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'),
+                name='timeline_unique_user_post'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-pub_date', '-post'),
+                name='timeline_user_pub_date_idx'
+            ),
+        )
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Записи лент'
+
+
+class ImageLock(models.Model):
+    """Row locked while a shared post image file is written or deleted.
+
+    See blog.images.lock_image.
+    """
+
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name='Имя файла'
+    )
+
+    class Meta:
+        verbose_name = 'блокировка фото'
+        verbose_name_plural = 'Блокировки фото'
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,160 @@
+import base64
+import json
+from collections.abc import Sequence
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage(Sequence):
+    """Page of keyset pagination, mimics django.core.paginator.Page."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} items>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset pagination without COUNT(*) and OFFSET.
+
+    Ordering must be unique, so the last field is usually the primary key.
+    Annotations with JSON values, like search rank, may be ordered by too,
+    and .values() querysets are paginated as well.
+    Cursor is an opaque urlsafe token with key values of the boundary row
+    and the direction to move in.
+    """
+
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, queryset, per_page, ordering=('-pub_date', '-id')):
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(name.lstrip('-') for name in self.ordering)
+        self.queryset = queryset.order_by(*self.ordering)
+
+    def get_field(self, name):
+        try:
+            return self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def to_python(self, name, value):
+        """Validate a decoded key value by the field or annotation type."""
+        field = self.get_field(name)
+        if field is None:
+            annotation = self.queryset.query.annotations.get(name)
+            field = getattr(annotation, 'output_field', None)
+        if field is None:
+            if not isinstance(value, (int, float, str)):
+                raise ValueError(value)
+            return value
+        return field.to_python(value)
+
+    def get_cursor_value(self, obj, name):
+        """Return JSON-friendly key value of a model instance or a row."""
+        if isinstance(obj, dict):
+            value = obj[name]
+            return value.isoformat() if hasattr(value, 'isoformat') else value
+        field = self.get_field(name)
+        if field is None:
+            return getattr(obj, name)
+        return field.value_to_string(obj)
+
+    def encode_cursor(self, obj, direction):
+        values = [self.get_cursor_value(obj, name) for name in self.fields]
+        return base64.urlsafe_b64encode(
+            json.dumps([direction, *values]).encode()
+        ).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            direction, *values = json.loads(base64.urlsafe_b64decode(
+                cursor + '=' * (-len(cursor) % 4)
+            ))
+            if (
+                direction not in (self.NEXT, self.PREVIOUS)
+                or len(values) != len(self.fields)
+            ):
+                raise ValueError
+            return direction, [
+                self.to_python(name, value)
+                for name, value in zip(self.fields, values)
+            ]
+        except (TypeError, ValueError, ValidationError) as error:
+            raise InvalidCursor(cursor) from error
+
+    def get_keyset_filter(self, values, direction):
+        """Build (f1 > v1) | (f1 = v1 & f2 > v2) | ... for the ordering."""
+        keyset_filter = Q()
+        equal = Q()
+        for name, field, value in zip(self.ordering, self.fields, values):
+            descending = name.startswith('-')
+            if direction == self.PREVIOUS:
+                descending = not descending
+            lookup = f'{field}__lt' if descending else f'{field}__gt'
+            keyset_filter |= equal & Q(**{lookup: value})
+            equal &= Q(**{field: value})
+        return keyset_filter
+
+    def get_page(self, cursor=None):
+        """Return page after (or before) the cursor, first page if invalid."""
+        direction, values = self.NEXT, None
+        if cursor:
+            try:
+                direction, values = self.decode_cursor(cursor)
+            except InvalidCursor:
+                pass
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(values, direction)
+            )
+        if direction == self.PREVIOUS:
+            queryset = queryset.reverse()
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+        if direction == self.PREVIOUS:
+            objects.reverse()
+            has_next, has_previous = values is not None, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+        return CursorPage(
+            objects,
+            self,
+            next_cursor=(
+                self.encode_cursor(objects[-1], self.NEXT)
+                if has_next and objects else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(objects[0], self.PREVIOUS)
+                if has_previous and objects else None
+            ),
+        )
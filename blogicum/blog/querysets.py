@@ -1,30 +1,32 @@
 from django.db import models
-from django.db.models import Count
+from django.db.models import Q
 from django.utils.timezone import now
 
 
+def get_published_filter():
+    """Return condition of posts visible to everyone."""
+    return Q(
+        is_published=True,
+        pub_date__lte=now(),
+        category__is_published=True
+    )
+
+
 class PostQuerySet(models.QuerySet):
 
     def selected(
         self,
         apply_published=True,
-        apply_related=True,
-        apply_annotated=True
+        apply_related=True
     ):
         """Return selected posts."""
         posts = self
         if apply_published:
-            posts = self.filter(
-                is_published=True,
-                pub_date__lte=now(),
-                category__is_published=True
-            )
+            posts = self.filter(get_published_filter())
         if apply_related:
             posts = posts.select_related('author', 'location', 'category')
-        if apply_annotated:
-            posts = posts.annotate(
-                comment_count=Count('comments')
-            ).order_by(
-                *self.model._meta.ordering
-            )
         return posts
+
+    def visible_to(self, user):
+        """Return posts visible to the user: published ones and own."""
+        return self.filter(get_published_filter() | Q(author_id=user.id))
@@ -0,0 +1,131 @@
+import re
+from itertools import islice
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Post
+
+WORDS = re.compile(r'\w+')
+BATCH_SIZE = 1000
+# Index backends by database vendor, LIKE scans for the rest.
+VENDOR_BACKENDS = {'sqlite': 'blog.search.SQLiteSearchBackend'}
+DEFAULT_BACKEND = 'blog.search.SearchBackend'
+
+
+def normalize(text):
+    """Fold ё to е, FTS5 unicode61 tokenizer keeps them apart."""
+    return text.replace('ё', 'е').replace('Ё', 'Е')
+
+
+def get_search_backend():
+    """Return BLOG_SEARCH_BACKEND, else the backend of the database."""
+    return import_string(
+        settings.BLOG_SEARCH_BACKEND
+        or VENDOR_BACKENDS.get(connection.vendor, DEFAULT_BACKEND)
+    )()
+
+
+class SearchBackend:
+    """Search with LIKE scans, for databases without an index backend.
+
+    Index backends keep their index in sync through update and remove,
+    called from signals, and rebuild, called after bulk inserts.
+    """
+
+    def update(self, post):
+        pass
+
+    def remove(self, post_id):
+        pass
+
+    def rebuild(self, batch_size=BATCH_SIZE):
+        return 0
+
+    def annotate_rank(self, queryset):
+        return queryset.annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    def search(self, queryset, query):
+        """Filter posts matching all words, annotate them with search_rank.
+
+        Higher rank is better.
+        """
+        words = WORDS.findall(query)
+        if not words:
+            return self.annotate_rank(queryset.none())
+        condition = Q()
+        for word in words:
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return self.annotate_rank(queryset.filter(condition))
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """Inverted index in the FTS5 table made by migration 0019.
+
+    The table keeps its own normalized copy of title and text, so it
+    survives the table rebuilds SQLite migrations do on blog_post.
+    """
+
+    table = 'blog_post_fts'
+    # bm25 weights of the title and text columns.
+    weights = '10.0, 1.0'
+
+    def update(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [post.id]
+            )
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, text)'
+                ' VALUES (%s, %s, %s)',
+                [post.id, normalize(post.title), normalize(post.text)]
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE rowid = %s', [post_id]
+            )
+
+    def rebuild(self, batch_size=BATCH_SIZE):
+        rows = (
+            Post.objects.order_by('id')
+            .values_list('id', 'title', 'text')
+            .iterator(chunk_size=batch_size)
+        )
+        indexed = 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            for batch in iter(lambda: list(islice(rows, batch_size)), []):
+                cursor.executemany(
+                    f'INSERT INTO {self.table} (rowid, title, text)'
+                    ' VALUES (%s, %s, %s)',
+                    [
+                        (post_id, normalize(title), normalize(text))
+                        for post_id, title, text in batch
+                    ]
+                )
+                indexed += len(batch)
+        return indexed
+
+    def search(self, queryset, query):
+        words = WORDS.findall(normalize(query))
+        if not words:
+            return self.annotate_rank(queryset.none())
+        # Quoted words cannot break the FTS5 query syntax.
+        match = ' '.join(f'"{word}"' for word in words)
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s',
+            [match]
+        )).annotate(search_rank=RawSQL(
+            f'SELECT -bm25({self.table}, {self.weights}) FROM {self.table}'
+            f' WHERE {self.table} MATCH %s'
+            f' AND rowid = {Post._meta.db_table}.id',
+            [match],
+            output_field=FloatField()
+        ))
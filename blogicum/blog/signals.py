@@ -0,0 +1,194 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_save
+)
+from django.dispatch import receiver
+
+from .caching import (
+    bump_feed_generation, bump_posts_generation, bump_version,
+    reset_next_publication
+)
+from .images import claim_image, release_image
+from .models import Category, Comment, Follow, Location, Post
+from .search import get_search_backend
+from .timelines import backfill, fan_out, prune
+
+User = get_user_model()
+
+# Post fields whose changes are indexed or fanned out.
+TRACKED_FIELDS = ('title', 'text', 'is_published', 'pub_date', 'author_id')
+
+VERSIONED_MODELS = {
+    Post: 'post',
+    Category: 'category',
+    Location: 'location',
+    User: 'user',
+}
+
+
+@receiver(post_init, sender=Comment)
+def remember_comment_post(sender, instance, **kwargs):
+    instance.loaded_post_id = instance.__dict__.get('post_id')
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_count(sender, instance, created, raw=False, **kwargs):
+    """Count the new comment, or move a moved one between posts."""
+    old_post_id = instance.loaded_post_id
+    instance.loaded_post_id = instance.post_id
+    if created and not raw:
+        Post.objects.filter(id=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+    elif not raw and old_post_id not in (None, instance.post_id):
+        Post.objects.filter(id=old_post_id, comment_count__gt=0).update(
+            comment_count=F('comment_count') - 1
+        )
+        Post.objects.filter(id=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+        bump_version('post', old_post_id)
+    bump_version('post', instance.post_id)
+    bump_feed_generation()
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(id=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+    bump_version('post', instance.post_id)
+    bump_feed_generation()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_object_version(sender, instance, created=False, update_fields=None,
+                        **kwargs):
+    if sender not in VERSIONED_MODELS:
+        return
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_version(VERSIONED_MODELS[sender], instance.pk)
+    bump_feed_generation()
+    # A new author, category or location is in no feed yet.
+    if sender is Post or not created:
+        bump_posts_generation()
+    if sender is Post:
+        reset_next_publication()
+
+
+def get_image_state(post):
+    """Return image name and renditions without loading deferred fields."""
+    image = post.__dict__.get('image')
+    return (
+        getattr(image, 'name', image),
+        post.__dict__.get('image_renditions', '')
+    )
+
+
+@receiver(post_init, sender=Post)
+def remember_image(sender, instance, **kwargs):
+    instance.loaded_image = get_image_state(instance)
+
+
+def get_field_state(post):
+    """Return loaded values of TRACKED_FIELDS, deferred ones are skipped."""
+    return {
+        name: post.__dict__[name]
+        for name in TRACKED_FIELDS if name in post.__dict__
+    }
+
+
+@receiver(post_init, sender=Post)
+def remember_fields(sender, instance, **kwargs):
+    instance.loaded_fields = get_field_state(instance)
+
+
+@receiver(pre_save, sender=Post)
+def find_changed_fields(sender, instance, **kwargs):
+    """Post.save lists every field in update_fields, compare values."""
+    state = get_field_state(instance)
+    instance.changed_fields = {
+        name for name, value in state.items()
+        if instance._state.adding
+        or name not in instance.loaded_fields
+        or instance.loaded_fields[name] != value
+    }
+    instance.loaded_fields = state
+
+
+@receiver(post_save, sender=Post)
+def release_replaced_image(sender, instance, raw=False, **kwargs):
+    name, renditions = instance.loaded_image
+    instance.loaded_image = get_image_state(instance)
+    new_name = instance.loaded_image[0]
+    if name and new_name is not None and name != new_name and not raw:
+        transaction.on_commit(partial(release_image, name, renditions))
+
+
+@receiver(pre_save, sender=Post)
+def remember_upload(sender, instance, raw=False, **kwargs):
+    instance.image_upload = None
+    # The descriptor wraps an assigned file, deferred images are not loaded.
+    if not raw and 'image' in instance.__dict__ and instance.image:
+        if not instance.image._committed:
+            instance.image_upload = instance.image.file
+
+
+@receiver(post_save, sender=Post)
+def claim_uploaded_image(sender, instance, **kwargs):
+    upload, instance.image_upload = instance.image_upload, None
+    if upload is not None and instance.image:
+        transaction.on_commit(
+            partial(claim_image, instance.image.name, upload)
+        )
+
+
+@receiver(post_delete, sender=Post)
+def release_deleted_image(sender, instance, **kwargs):
+    if instance.image:
+        transaction.on_commit(partial(
+            release_image, instance.image.name, instance.image_renditions
+        ))
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    if {'title', 'text'} & instance.changed_fields:
+        get_search_backend().update(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    get_search_backend().remove(instance.id)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, raw=False, **kwargs):
+    if not raw and (
+        {'is_published', 'pub_date', 'author_id'} & instance.changed_fields
+    ):
+        fan_out(instance)
+
+
+@receiver(post_save, sender=Follow)
+def backfill_timeline(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        backfill(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def prune_timeline(sender, instance, **kwargs):
+    prune(instance.user_id, instance.author_id)
+
+
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+def bump_following_version(sender, instance, **kwargs):
+    """Invalidate profile pages showing the follow state of the user."""
+    bump_version('following', instance.user_id)
@@ -0,0 +1,52 @@
+import hashlib
+import posixpath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Store each file once under the SHA-256 digest of its content.
+
+    Saving an already stored content returns the existing name, so files
+    are shared between posts and deleted only when unreferenced,
+    see blog.images.release_image and claim_image.
+    """
+
+    def get_digest_name(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        digest = digest.hexdigest()
+        directory, basename = posixpath.split(name)
+        extension = posixpath.splitext(basename)[1].lower()
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        name = self.get_digest_name(name, content)
+        if self.exists(name):
+            return name
+        return self._save(name, content)
+
+    def restore(self, name, content):
+        """Write the content under its stored name again if it is gone."""
+        if self.exists(name):
+            return name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        content.seek(0)
+        return self._save(name, content)
+
+    def save_derived(self, name, content):
+        """Save content derived from a stored file under the exact name."""
+        self.delete(name)
+        return super().save(name, content)
+
+
+post_image_storage = ContentAddressedStorage()
@@ -0,0 +1,20 @@
+from django import template
+
+from blog.images import get_renditions
+
+register = template.Library()
+
+
+@register.filter
+def srcset(post, image_format):
+    """Return srcset of post image renditions in the format."""
+    return ', '.join(
+        f'{url} {width}w' for url, width in get_renditions(post, image_format)
+    )
+
+
+@register.filter
+def rendition_url(post, image_format):
+    """Return URL of the largest rendition in the format."""
+    renditions = get_renditions(post, image_format)
+    return renditions[-1][0] if renditions else post.image.url
@@ -0,0 +1,119 @@
+"""Personal timelines with fan-out on write.
+
+A published post is copied into TimelineEntry rows of every follower of
+its author, so reading a timeline is a range scan of one index instead
+of a join over all followed authors.
+"""
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils.timezone import now
+
+from .models import Follow, Post, TimelineEntry
+
+BATCH_SIZE = 1000
+
+
+def batches(iterable, batch_size=BATCH_SIZE):
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, batch_size)), [])
+
+
+def get_timeline(user):
+    """Return entries of the user timeline visible now, posts selected."""
+    return TimelineEntry.objects.filter(
+        user_id=user.id,
+        pub_date__lte=now(),
+        post__is_published=True,
+        post__category__is_published=True,
+    ).select_related('post__author', 'post__location', 'post__category')
+
+
+def fan_out(post):
+    """Put the post into timelines of followers, or drop it if hidden."""
+    entries = TimelineEntry.objects.filter(post_id=post.id)
+    if not post.is_published:
+        entries.delete()
+        return
+    # Entries of readers who follow only the previous author.
+    entries.exclude(Exists(Follow.objects.filter(
+        user_id=OuterRef('user_id'), author_id=post.author_id
+    ))).delete()
+    entries.update(pub_date=post.pub_date)
+    followers = (
+        Follow.objects.filter(author_id=post.author_id)
+        .values_list('user_id', flat=True)
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for batch in batches(followers):
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(
+                    user_id=user_id, post_id=post.id, pub_date=post.pub_date
+                )
+                for user_id in batch
+            ],
+            ignore_conflicts=True
+        )
+
+
+def backfill(user_id, author_id, limit=None):
+    """Copy the latest published posts of the author into the timeline.
+
+    Return the number of entries added.
+    """
+    if limit is None:
+        limit = settings.BLOG_TIMELINE_BACKFILL
+    posts = list(
+        Post.objects.filter(author_id=author_id, is_published=True)
+        .order_by('-pub_date')
+        .values_list('id', 'pub_date')[:limit]
+    )
+    present = set(TimelineEntry.objects.filter(
+        user_id=user_id, post_id__in=[post_id for post_id, _ in posts]
+    ).values_list('post_id', flat=True))
+    # Conflicts are left only by a concurrent fan-out.
+    created = TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=user_id, post_id=post_id, pub_date=pub_date)
+            for post_id, pub_date in posts if post_id not in present
+        ],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True
+    )
+    return len(created)
+
+
+def prune(user_id, author_id):
+    """Remove posts of an unfollowed author from the timeline."""
+    return TimelineEntry.objects.filter(
+        user_id=user_id, post__author_id=author_id
+    ).delete()[0]
+
+
+def prune_orphans(batch_size=BATCH_SIZE):
+    """Remove entries whose follow is gone, in batches of ids."""
+    orphans = TimelineEntry.objects.exclude(Exists(Follow.objects.filter(
+        user_id=OuterRef('user_id'), author_id=OuterRef('post__author_id')
+    )))
+    removed = 0
+    while True:
+        ids = list(orphans.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return removed
+        removed += TimelineEntry.objects.filter(id__in=ids).delete()[0]
+
+
+def trim(user_id, keep):
+    """Keep only the latest entries of the timeline, ties included."""
+    entries = TimelineEntry.objects.filter(user_id=user_id)
+    if keep <= 0:
+        return entries.delete()[0]
+    cutoff = list(
+        entries.order_by('-pub_date', '-post_id')
+        .values_list('pub_date', flat=True)[keep - 1:keep]
+    )
+    if not cutoff:
+        return 0
+    return entries.filter(pub_date__lt=cutoff[0]).delete()[0]
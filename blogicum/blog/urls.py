@@ -1,16 +1,39 @@
 from django.urls import path
 
-from . import views
+from . import api, feeds, views
 
 app_name = 'blog'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('search/', views.search, name='search'),
+    path('api/posts/', api.posts, name='api_posts'),
+    path('api/posts/<int:post_id>/', api.post_detail, name='api_post_detail'),
+    path('api/category/<slug:category_slug>/posts/', api.category_posts,
+         name='api_category_posts'),
+    path('api/profile/<str:username>/posts/', api.profile_posts,
+         name='api_profile_posts'),
+    path('feeds/rss/', feeds.PostsFeed(), name='index_rss'),
+    path('feeds/atom/', feeds.AtomPostsFeed(), name='index_atom'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('posts/<int:post_id>/comments/', views.post_comments,
+         name='post_comments'),
     path('category/<slug:category_slug>/',
          views.category_posts, name='category_posts'),
+    path('category/<slug:category_slug>/rss/',
+         feeds.CategoryPostsFeed(), name='category_rss'),
+    path('category/<slug:category_slug>/atom/',
+         feeds.AtomCategoryPostsFeed(), name='category_atom'),
     path('profile/edit/', views.profile_edit_view, name='edit_profile'),
     path('profile/<str:username>/', views.profile_view, name='profile'),
+    path('profile/<str:username>/rss/', feeds.ProfilePostsFeed(),
+         name='profile_rss'),
+    path('profile/<str:username>/atom/', feeds.AtomProfilePostsFeed(),
+         name='profile_atom'),
+    path('profile/<str:username>/follow/', views.follow, name='follow'),
+    path('profile/<str:username>/unfollow/', views.unfollow,
+         name='unfollow'),
+    path('feed/', views.timeline, name='timeline'),
     path('posts/create/', views.PostCreateView.as_view(), name='create_post'),
     path('posts/<int:post_id>/edit/', views.PostUpdateView.as_view(),
          name='edit_post'),
@@ -1,24 +1,65 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.forms import UserChangeForm
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
+from django.db import transaction
 from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render, reverse
+from django.views.decorators.http import require_POST
 from django.views.generic import CreateView, DeleteView, UpdateView
 
+from .caching import (
+    PAGE_QUERY_PARAMS, cache_anonymous_page, conditional_page,
+    get_feed_validators, get_loaded_post_validators, get_post_validators,
+    get_profile_validators, set_page_validators
+)
 from .forms import CommentForm, PostForm
-from .models import Category, Comment, Post
+from .models import Category, Comment, Follow, Post
+from .paginators import CursorPaginator
+from .search import get_search_backend
+from .timelines import get_timeline
 
 
 ITEMS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 50
 
 
 def get_page_obj(posts, request, items_per_page=ITEMS_PER_PAGE):
-    """Make page_obj for page context."""
+    """Make page_obj for page context.
+
+    Keyset pagination is used when enabled in settings or requested
+    with ?cursor=, numbered pages otherwise.
+    """
+    if settings.BLOG_CURSOR_PAGINATION or 'cursor' in request.GET:
+        return CursorPaginator(posts, items_per_page).get_page(
+            request.GET.get('cursor')
+        )
     return Paginator(posts, items_per_page).get_page(request.GET.get('page'))
 
 
+def get_page_query(request):
+    """Return the query string without pagination params, for page links."""
+    query = request.GET.copy()
+    for name in PAGE_QUERY_PARAMS:
+        query.pop(name, None)
+    return query.urlencode()
+
+
+def get_comments_page(post, cursor, items_per_page=COMMENTS_PER_PAGE):
+    """Make page of post comments, from old to new."""
+    return CursorPaginator(
+        post.comments.select_related('author'),
+        items_per_page,
+        ordering=('created_at', 'id')
+    ).get_page(cursor)
+
+
+@conditional_page(
+    lambda request: get_feed_validators(Post.objects.selected(), 'index')
+)
+@cache_anonymous_page
 def index(request):
     return render(
         request,
@@ -32,24 +73,73 @@ def index(request):
     )
 
 
+def search(request):
+    """Published posts matching the query, the most relevant first."""
+    query = request.GET.get('q', '').strip()
+    posts = get_search_backend().search(Post.objects.selected(), query)
+    return render(
+        request,
+        'blog/search.html',
+        context={
+            'query': query,
+            'page_query': get_page_query(request),
+            'page_obj': CursorPaginator(
+                posts, ITEMS_PER_PAGE, ordering=('-search_rank', '-id')
+            ).get_page(request.GET.get('cursor'))
+        }
+    )
+
+
+@conditional_page(get_post_validators, probe_conditional_only=True)
 def post_detail(request, post_id):
-    user = request.user
-    post = get_object_or_404(Post, id=post_id)
-    if post.author != user:
-        post = get_object_or_404(
-            Post.objects.selected(apply_related=False, apply_annotated=False),
-            id=post_id
-        )
+    post = get_object_or_404(
+        Post.objects.selected(apply_published=False).visible_to(request.user),
+        id=post_id
+    )
     form = CommentForm(request.POST or None)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.post = post
         comment.save()
         return redirect('blog:post_detail', post.id)
-    return render(request, 'blog/detail.html',
-                  context={'form': form, 'post': post})
+    response = render(
+        request, 'blog/detail.html',
+        context={
+            'form': form,
+            'post': post,
+            'comments': get_comments_page(
+                post, request.GET.get('comments_cursor')
+            )
+        }
+    )
+    if request.method in ('GET', 'HEAD'):
+        set_page_validators(
+            request, response, get_loaded_post_validators(post)
+        )
+    return response
 
 
+def post_comments(request, post_id):
+    post = get_object_or_404(
+        Post.objects.visible_to(request.user).only('id'),
+        id=post_id
+    )
+    return render(
+        request, 'includes/comment_list.html',
+        context={
+            'post': post,
+            'comments': get_comments_page(post, request.GET.get('cursor'))
+        }
+    )
+
+
+@conditional_page(
+    lambda request, category_slug: get_feed_validators(
+        Post.objects.selected().filter(category__slug=category_slug),
+        request.path
+    )
+)
+@cache_anonymous_page
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category,
@@ -68,12 +158,21 @@ def category_posts(request, category_slug):
     )
 
 
+@conditional_page(get_profile_validators)
+@cache_anonymous_page
 def profile_view(request, username):
     author = get_object_or_404(User, username=username)
     return render(
         request, 'blog/profile.html',
         context={
             'profile': author,
+            'is_following': (
+                request.user.is_authenticated
+                and request.user != author
+                and Follow.objects.filter(
+                    user_id=request.user.id, author=author
+                ).exists()
+            ),
             'page_obj': get_page_obj(
                 author.posts.selected(
                     apply_published=(request.user != author)
@@ -84,6 +183,36 @@ def profile_view(request, username):
     )
 
 
+@login_required
+def timeline(request):
+    """Posts of followed authors, materialized by blog.timelines."""
+    page_obj = CursorPaginator(
+        get_timeline(request.user),
+        ITEMS_PER_PAGE,
+        ordering=('-pub_date', '-post_id')
+    ).get_page(request.GET.get('cursor'))
+    page_obj.object_list = [entry.post for entry in page_obj]
+    return render(request, 'blog/timeline.html', {'page_obj': page_obj})
+
+
+@login_required
+@require_POST
+def follow(request, username):
+    author = get_object_or_404(User, username=username)
+    if author != request.user:
+        Follow.objects.get_or_create(user=request.user, author=author)
+    return redirect('blog:profile', username)
+
+
+@login_required
+@require_POST
+def unfollow(request, username):
+    Follow.objects.filter(
+        user=request.user, author__username=username
+    ).delete()
+    return redirect('blog:profile', username)
+
+
 @login_required
 def profile_edit_view(request):
     template = 'blog/profile_edit.html'
@@ -96,8 +225,16 @@ def profile_edit_view(request):
 
 class OnlyAuthorMixin(UserPassesTestMixin):
 
+    def get_object(self, queryset=None):
+        """Fetch the object once for the permission check and the view."""
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
+
     def test_func(self):
-        return self.get_object().author == self.request.user
+        return self.get_object().author_id == self.request.user.id
 
 
 class PostMixin:
@@ -137,6 +274,7 @@ class PostUpdateView(PostMixin, OnlyAuthorMixin, UpdateView):
 
 
 class PostDeleteView(PostMixin, OnlyAuthorMixin, DeleteView):
+    queryset = Post.objects.select_related('location')
 
     def get_success_url(self):
         return reverse('blog:profile', args=[self.request.user.username])
@@ -157,8 +295,13 @@ class CommentMixinView:
 
 class CommentCreateView(CommentMixinView, LoginRequiredMixin, CreateView):
 
+    @transaction.atomic
     def form_valid(self, form):
-        form.instance.post = get_object_or_404(Post, id=self.kwargs['post_id'])
+        if not Post.objects.visible_to(self.request.user).filter(
+            id=self.kwargs['post_id']
+        ).exists():
+            raise Http404('Публикация не найдена.')
+        form.instance.post_id = self.kwargs['post_id']
         form.instance.author = self.request.user
         return super().form_valid(form)
 
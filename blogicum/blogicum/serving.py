@@ -0,0 +1,219 @@
+"""Production serving of static and media files by the app itself.
+
+Enabled with BLOG_SERVE_FILES when no web server is in front of the app.
+"""
+import gzip
+import mimetypes
+import os
+import re
+import stat
+from functools import partial
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponse
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/javascript', 'application/json',
+    'application/xml', 'image/svg+xml', 'image/x-icon',
+    'image/vnd.microsoft.icon',
+)
+MIN_COMPRESS_SIZE = 256
+COMPRESSORS = {'.gz': partial(gzip.compress, compresslevel=9, mtime=0)}
+if brotli is not None:
+    COMPRESSORS['.br'] = brotli.compress
+# Preferred first.
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+# Manifest names like app.0123456789ab.css, content-addressed media and
+# its renditions like renditions/<sha256>.png_320.webp.
+HASHED_NAME = re.compile(
+    r'\.[0-9a-f]{12}\.\w+$|(^|/)[0-9a-f]{64}\.\w+(_\d+\.\w+)?$'
+)
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Hashed static names plus precompressed .gz and .br copies."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if not dry_run:
+            # Intermediate names of several passes are gone, the manifest
+            # holds the final ones.
+            for name in set(self.hashed_files.values()):
+                self.compress(name)
+
+    def compress(self, name):
+        content_type = mimetypes.guess_type(name)[0] or ''
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return
+        with self.open(name) as file:
+            content = file.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for extension, compressor in COMPRESSORS.items():
+            compressed = compressor(content)
+            if len(compressed) < len(content):
+                self.delete(name + extension)
+                self._save(name + extension, ContentFile(compressed))
+
+
+class FileRange:
+    """Read at most length bytes from the offset.
+
+    The file stays exposed through fileno(), so servers with
+    wsgi.file_wrapper can still use sendfile from the current position.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def get_accepted_encodings(request):
+    encodings = set()
+    for token in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        encoding, _, params = token.partition(';')
+        if not re.fullmatch(r'\s*q=0(\.0*)?\s*', params):
+            encodings.add(encoding.strip().lower())
+    return encodings
+
+
+def get_variant(request, path):
+    """Return (encoding, path, stat) of the best precompressed copy."""
+    if 'HTTP_RANGE' not in request.META:
+        accepted = get_accepted_encodings(request)
+        for encoding, extension in ENCODINGS:
+            if encoding in accepted:
+                variant = path + extension
+                try:
+                    return encoding, variant, os.stat(variant)
+                except OSError:
+                    pass
+    return None, path, os.stat(path)
+
+
+def get_range(request, etag, modified, size):
+    """Return (start, end) of a single byte range, None for the whole file.
+
+    Ranges of the validators mismatching If-Range are ignored, as are
+    multiple ranges.
+    """
+    match = RANGE.match(request.META.get('HTTP_RANGE', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range != etag and (
+        parse_http_date_safe(if_range) != modified
+    ):
+        return None
+    start, end = match.groups()
+    if not start:
+        return max(0, size - int(end)), size - 1
+    return int(start), min(int(end), size - 1) if end else size - 1
+
+
+def get_cache_control(path):
+    if HASHED_NAME.search(path):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={settings.BLOG_FILES_MAX_AGE}'
+
+
+def get_file_response(request, full_path, file_path, etag, modified, size):
+    content_type = mimetypes.guess_type(full_path)[0]
+    byte_range = get_range(request, etag, modified, size)
+    if byte_range is None:
+        return FileResponse(
+            open(file_path, 'rb'),
+            filename=os.path.basename(full_path),
+            content_type=content_type or 'application/octet-stream'
+        )
+    start, end = byte_range
+    if start > end:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    response = FileResponse(
+        FileRange(open(file_path, 'rb'), start, end - start + 1),
+        status=206,
+        content_type=content_type or 'application/octet-stream'
+    )
+    response['Content-Length'] = end - start + 1
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+@require_safe
+def serve(request, path, document_root):
+    """Serve a file with validators, ranges and precompressed copies."""
+    try:
+        full_path = safe_join(document_root, path)
+        encoding, file_path, file_stat = get_variant(request, full_path)
+    except (SuspiciousFileOperation, OSError):
+        raise Http404('Файл не найден.')
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise Http404('Файл не найден.')
+    modified = int(file_stat.st_mtime)
+    size = file_stat.st_size
+    etag = f'"{file_stat.st_mtime_ns:x}-{size:x}"'
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(modified),
+        'Cache-Control': get_cache_control(path),
+        'Accept-Ranges': 'bytes',
+    }
+    response = get_conditional_response(
+        request, etag=etag, last_modified=modified
+    )
+    if response is None:
+        response = get_file_response(
+            request, full_path, file_path, etag, modified, size
+        )
+    for header, value in headers.items():
+        response[header] = value
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def get_urlpatterns():
+    """Routes for STATIC_ROOT and MEDIA_ROOT like django.conf.urls.static."""
+    return [
+        re_path(
+            r'^{}(?P<path>.*)$'.format(re.escape(prefix.lstrip('/'))),
+            serve,
+            {'document_root': document_root}
+        )
+        for prefix, document_root in (
+            (settings.STATIC_URL, settings.STATIC_ROOT),
+            (settings.MEDIA_URL, settings.MEDIA_ROOT),
+        )
+    ]
@@ -64,6 +64,18 @@ DATABASES = {
     }
 }
 
+# Cached pages and the version keys invalidating them must be shared by
+# all worker processes, a per-process cache like LocMemCache serves stale
+# pages (checked by blog.W001). Use Redis or Memcached for several hosts.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        # Culling lists the whole directory, keep it bounded.
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -95,6 +107,8 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+STATIC_ROOT = BASE_DIR / 'collected_static'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
@@ -103,6 +117,8 @@ LOGIN_REDIRECT_URL = 'blog:index'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_URL = '/media/'
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -110,3 +126,32 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 INTERNAL_IPS = [
     '127.0.0.1'
 ]
+
+BLOG_CURSOR_PAGINATION = False
+
+BLOG_POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 5
+
+BLOG_IMAGE_WORKERS = 2
+
+BLOG_IMAGE_MAX_UPLOAD_SIZE = 20 * 1024 * 1024
+
+BLOG_IMAGE_MAX_DIMENSION = 2560
+
+# None picks the backend of the database, see blog.search.
+BLOG_SEARCH_BACKEND = None
+
+BLOG_TIMELINE_BACKFILL = 100
+
+BLOG_TIMELINE_MAX_ENTRIES = 1000
+
+# Serve static and media files from the app with long-lived caching.
+BLOG_SERVE_FILES = False
+
+BLOG_FILES_MAX_AGE = 60 * 60
+
+if BLOG_SERVE_FILES:
+    STATICFILES_STORAGE = (
+        'blogicum.serving.CompressedManifestStaticFilesStorage'
+    )
@@ -5,6 +5,8 @@ from django.contrib.auth.forms import UserCreationForm
 from django.urls import path, include, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from . import serving
+
 
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
@@ -32,3 +34,5 @@ if settings.DEBUG:
         + [path('__debug__/', include('debug_toolbar.urls')), ]
         + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     )
+elif settings.BLOG_SERVE_FILES:
+    urlpatterns += serving.get_urlpatterns()
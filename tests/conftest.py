@@ -1,7 +1,9 @@
 import os
 import re
 import time
+from datetime import timedelta
 from http import HTTPStatus
+from io import BytesIO
 from inspect import getsource
 from pathlib import Path
 from typing import (
@@ -19,12 +21,15 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.utils import timezone
 from mixer.backend.django import mixer as _mixer
+from PIL import Image
 
 N_PER_FIXTURE = 3
 N_PER_PAGE = 10
@@ -41,6 +46,15 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def local_cache():
+    """Start each test with an empty in-memory cache."""
+    with override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }}):
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -126,6 +140,36 @@ def unlogged_client(client):
     return client
 
 
+@pytest.fixture
+def posts(mixer, user, published_category):
+    """Published posts of the user, the newest first."""
+    return [
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            location=None, is_published=True,
+            pub_date=timezone.now() - timedelta(hours=index)
+        )
+        for index in range(1, 26)
+    ]
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    """Store uploads in a temporary MEDIA_ROOT, make renditions inline."""
+    with override_settings(MEDIA_ROOT=tmp_path, BLOG_IMAGE_WORKERS=0):
+        yield tmp_path
+
+
+@pytest.fixture
+def make_image():
+    """Return a factory of small single-color PNG uploads."""
+    def make_image(name, color):
+        data = BytesIO()
+        Image.new("RGB", (50, 50), color).save(data, "PNG")
+        return SimpleUploadedFile(name, data.getvalue())
+    return make_image
+
+
 @pytest.fixture
 def another_user_client(another_user):
     client = Client()
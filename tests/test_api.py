@@ -0,0 +1,65 @@
+import gzip
+import json
+
+import pytest
+
+
+@pytest.mark.django_db
+def test_api_posts_paginated(client, posts):
+    response = client.get('/api/posts/', {'fields': 'id,title,author'})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['results'][0] == {
+        'id': posts[0].id,
+        'title': posts[0].title,
+        'author': posts[0].author.username,
+    }, 'Убедитесь, что API возвращает только запрошенные поля.'
+    assert data['previous'] is None
+    rest = client.get(
+        '/api/posts/', {'fields': 'id', 'cursor': data['next']}
+    ).json()
+    assert [item['id'] for item in data['results'] + rest['results']] == [
+        post.id for post in posts
+    ]
+    assert rest['next'] is None
+
+
+@pytest.mark.django_db
+def test_api_post_detail(client, user_client, posts):
+    post = posts[0]
+    data = client.get(f'/api/posts/{post.id}/').json()
+    assert data['id'] == post.id and data['category'] == post.category.slug
+    assert data['image'] == post.image.url
+
+    post.is_published = False
+    post.save()
+    response = client.get(f'/api/posts/{post.id}/')
+    assert response.status_code == 404
+    assert 'detail' in response.json()
+    assert user_client.get(f'/api/posts/{post.id}/').status_code == 200, (
+        'Убедитесь, что автор видит свою неопубликованную публикацию.'
+    )
+
+
+@pytest.mark.django_db
+def test_api_errors_gzip_and_etag(client, posts):
+    response = client.get('/api/posts/', {'fields': 'title,password'})
+    assert response.status_code == 400
+    assert 'password' in response.json()['detail']
+
+    response = client.get('/api/posts/', HTTP_ACCEPT_ENCODING='gzip')
+    assert response['Content-Encoding'] == 'gzip'
+    assert len(json.loads(gzip.decompress(response.content))['results']) == 20
+    response = client.get(
+        '/api/posts/', HTTP_ACCEPT_ENCODING='gzip',
+        HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert response.status_code == 304
+
+    category = posts[0].category
+    assert client.get(
+        f'/api/category/{category.slug}/posts/'
+    ).status_code == 200
+    assert client.get(
+        f'/api/profile/{posts[0].author.username}/posts/'
+    ).status_code == 200
@@ -0,0 +1,60 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(client, url, method='get', data=None):
+    with CaptureQueriesContext(connection) as queries:
+        response = getattr(client, method)(url, data=data)
+    assert response.status_code in (200, 302)
+    return [query['sql'] for query in queries.captured_queries]
+
+
+def object_queries(queries, table):
+    return [
+        sql for sql in queries
+        if sql.startswith('SELECT') and f'FROM "{table}"' in sql
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('method', ('get', 'post'))
+@pytest.mark.parametrize('action', ('edit', 'delete'))
+def test_post_fetched_once(
+        user_client, post_with_published_location, method, action
+):
+    post = post_with_published_location
+    data = {
+        'title': 'Заголовок', 'text': 'Текст',
+        'pub_date': '2020-01-01 00:00', 'category': post.category_id,
+    }
+    queries = count_queries(
+        user_client, f'/posts/{post.id}/{action}/', method, data
+    )
+    assert len(object_queries(queries, 'blog_post')) == 1, (
+        'Убедитесь, что публикация загружается из базы один раз.'
+    )
+    assert not object_queries(queries, 'auth_user')[1:], (
+        'Убедитесь, что автор публикации не загружается отдельным запросом.'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('method', ('get', 'post'))
+@pytest.mark.parametrize('action', ('edit_comment', 'delete_comment'))
+def test_comment_fetched_once(
+        user_client, user, post_with_published_location, mixer, method,
+        action
+):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    queries = count_queries(
+        user_client, f'/posts/{post.id}/{action}/{comment.id}/', method,
+        {'text': 'Новый текст'}
+    )
+    assert len(object_queries(queries, 'blog_comment')) == 1, (
+        'Убедитесь, что комментарий загружается из базы один раз.'
+    )
+    assert not object_queries(queries, 'auth_user')[1:], (
+        'Убедитесь, что автор комментария не загружается отдельным запросом.'
+    )
@@ -0,0 +1,66 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.management.commands.benchmark_urls import ANONYMOUS
+from blog.models import Comment, Post
+
+
+@pytest.fixture
+def generated_content(db):
+    call_command(
+        'generate_content', users=5, categories=2, locations=2, posts=30,
+        comments=60, batch_size=7, stdout=StringIO()
+    )
+
+
+@pytest.mark.django_db
+def test_generate_content(generated_content):
+    assert Post.objects.count() == 30
+    assert Comment.objects.count() == 60
+    assert sum(Post.objects.values_list('comment_count', flat=True)) == 60
+
+
+@pytest.mark.django_db
+def test_generate_content_reproducible():
+    def generate():
+        call_command(
+            'generate_content', users=2, categories=1, locations=1,
+            posts=5, comments=5, seed=7, stdout=StringIO()
+        )
+        return list(
+            Post.objects.order_by('id').values_list('title', 'text')
+        )
+
+    first = generate()
+    Post.objects.all().delete()
+    assert generate() == first, (
+        'Убедитесь, что с одним --seed генерируются одинаковые публикации.'
+    )
+
+
+@pytest.mark.django_db
+def test_benchmark_urls_detects_regressions(generated_content, tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    call_command(
+        'benchmark_urls', iterations=2, baseline=str(baseline),
+        save_baseline=True, stdout=StringIO()
+    )
+    results = json.loads(baseline.read_text())
+    assert all(
+        result['status'] == 200 for name, result in results.items()
+        if not name.endswith(ANONYMOUS)
+    ), results
+    assert results['blog:index' + ANONYMOUS]['status'] == 200, (
+        'Убедитесь, что страницы измеряются и для анонимного посетителя.'
+    )
+    for result in results.values():
+        result['queries'] = 0
+    baseline.write_text(json.dumps(results))
+    with pytest.raises(CommandError, match='запросов'):
+        call_command(
+            'benchmark_urls', iterations=2, baseline=str(baseline),
+            tolerance=1000, stdout=StringIO()
+        )
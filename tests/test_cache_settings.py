@@ -0,0 +1,30 @@
+from django.test.utils import override_settings
+
+from blog.checks import check_shared_cache
+from blogicum import settings as project_settings
+
+
+def test_shared_cache_configured():
+    with override_settings(CACHES=project_settings.CACHES):
+        assert not check_shared_cache(None), (
+            'Убедитесь, что в CACHES указан кеш, общий для процессов.'
+        )
+
+
+def test_process_local_cache_warned():
+    with override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }}):
+        assert [
+            warning.id for warning in check_shared_cache(None)
+        ] == ['blog.W001'], (
+            'Убедитесь, что кеш в памяти процесса вызывает предупреждение.'
+        )
+
+
+def test_file_cache_bounded():
+    options = project_settings.CACHES['default'].get('OPTIONS', {})
+    assert options.get('MAX_ENTRIES', 300) > 300, (
+        'Убедитесь, что для файлового кеша задан MAX_ENTRIES под число'
+        ' страниц и карточек сайта.'
+    )
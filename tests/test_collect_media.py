@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+from io import StringIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+
+from blog.images import get_rendition_name, lock_image
+from blog.management.commands import collect_media
+from blog.models import ImageLock, Post
+from blog.storage import post_image_storage
+
+
+@pytest.mark.django_db
+def test_collect_media_removes_orphans(
+        media_root, make_image, mixer, published_category
+):
+    post = mixer.blend(
+        'blog.Post', category=published_category,
+        image=make_image('a.png', 'red')
+    )
+    orphan = post_image_storage.save('posts/b.png', make_image('b.png', 'blue'))
+    orphan_rendition = get_rendition_name(orphan, 320, 'webp')
+    post_image_storage.save_derived(orphan_rendition, ContentFile(b'webp'))
+    kept_rendition = get_rendition_name(post.image.name, 320, 'webp')
+    post_image_storage.save_derived(kept_rendition, ContentFile(b'webp'))
+
+    call_command('collect_media', '--min-age=0', '--dry-run', stdout=StringIO())
+    assert post_image_storage.exists(orphan), (
+        'Убедитесь, что с --dry-run файлы не удаляются.'
+    )
+
+    call_command('collect_media', stdout=StringIO())
+    assert post_image_storage.exists(orphan), (
+        'Убедитесь, что свежие файлы не удаляются.'
+    )
+
+    out = StringIO()
+    call_command('collect_media', '--min-age=0', '--batch-size=1', stdout=out)
+    assert 'Удалено файлов: 2' in out.getvalue()
+    assert not post_image_storage.exists(orphan)
+    assert not post_image_storage.exists(orphan_rendition)
+    assert post_image_storage.exists(post.image.name), (
+        'Убедитесь, что фото публикаций не удаляются.'
+    )
+    assert post_image_storage.exists(kept_rendition)
+
+
+@pytest.mark.django_db
+def test_collect_media_rechecks_under_lock(
+        media_root, make_image, mixer, published_category, monkeypatch
+):
+    post = mixer.blend('blog.Post', category=published_category)
+    orphan = post_image_storage.save(
+        'posts/b.png', make_image('b.png', 'blue')
+    )
+
+    @contextmanager
+    def lock_claimed(name):
+        with lock_image(name):
+            # A post claims the file between the scan and the lock.
+            Post.objects.filter(id=post.id).update(image=name)
+            yield
+
+    monkeypatch.setattr(collect_media, 'lock_image', lock_claimed)
+    out = StringIO()
+    call_command('collect_media', '--min-age=0', stdout=out)
+    assert 'Удалено файлов: 0' in out.getvalue()
+    assert post_image_storage.exists(orphan), (
+        'Убедитесь, что перед удалением файла ссылки на него проверяются'
+        ' повторно под блокировкой `lock_image`.'
+    )
+    assert not ImageLock.objects.exists()
@@ -0,0 +1,94 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    user_client.post(f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что счётчик комментариев увеличивается'
+        ' при добавлении комментария.'
+    )
+    comment = post.comments.first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что счётчик комментариев уменьшается'
+        ' при удалении комментария.'
+    )
+
+
+@pytest.mark.django_db
+def test_stale_post_save_keeps_comment_count(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.blend(Comment, post=post)
+    post.title = 'Новый заголовок'
+    post.save()
+    post.refresh_from_db()
+    assert post.comment_count == 1
+
+
+@pytest.mark.django_db
+def test_comment_moved_to_another_post(mixer, post_with_published_location):
+    post = post_with_published_location
+    other = mixer.blend(
+        Post, author=post.author, category=post.category, location=None
+    )
+    comment = mixer.blend(Comment, post=post)
+    comment = Comment.objects.get(id=comment.id)
+    comment.post = other
+    comment.save()
+    post.refresh_from_db()
+    other.refresh_from_db()
+    assert (post.comment_count, other.comment_count) == (0, 1), (
+        'Убедитесь, что при переносе комментария счётчики обеих'
+        ' публикаций пересчитываются.'
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend(Comment, post=post)
+    Post.objects.filter(id=post.id).update(comment_count=100)
+    call_command('recount_comments', batch_size=1)
+    post.refresh_from_db()
+    assert post.comment_count == 3
+
+
+@pytest.mark.django_db
+def test_comment_create_checks_post_in_one_query(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    with CaptureQueriesContext(connection) as queries:
+        user_client.post(f'/posts/{post.id}/comment/', data={'text': 'Текст'})
+    post_selects = [
+        query['sql'] for query in queries.captured_queries
+        if query['sql'].startswith('SELECT') and 'blog_post' in query['sql']
+    ]
+    assert len(post_selects) == 1 and 'LIMIT 1' in post_selects[0]
+    assert Comment.objects.filter(post=post).count() == 1
+
+
+@pytest.mark.django_db
+def test_comment_to_unpublished_post_not_found(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.post(
+        f'/posts/{post.id}/comment/', data={'text': 'Текст'}
+    )
+    assert response.status_code == 404
+    assert not Comment.objects.exists()
@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def revalidate(client, url, etag):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    return response, queries
+
+
+@pytest.mark.django_db
+def test_index_not_modified(client, user_client, post_with_published_location):
+    etag = client.get('/')['ETag']
+    response, queries = revalidate(client, '/', etag)
+    assert response.status_code == 304, (
+        'Убедитесь, что главная страница отвечает 304 на повторный запрос.'
+    )
+    assert not response.templates and not len(queries)
+    assert user_client.get('/')['ETag'] != etag, (
+        'Убедитесь, что ETag зависит от пользователя.'
+    )
+
+    post_with_published_location.title = 'Новый заголовок'
+    post_with_published_location.save()
+    assert revalidate(client, '/', etag)[0].status_code == 200
+
+
+@pytest.mark.django_db
+def test_detail_not_modified(
+        user_client, post_with_published_location, mixer
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    comment = mixer.blend('blog.Comment', post=post)
+    etag = user_client.get(url)['ETag']
+    response, queries = revalidate(user_client, url, etag)
+    assert response.status_code == 304
+    assert not response.templates
+    assert not any(
+        '"blog_comment"."text"' in query['sql']
+        for query in queries.captured_queries
+    ), 'Убедитесь, что ответ 304 не загружает публикацию и комментарии.'
+
+    updated_at = comment.updated_at
+    comment.text = 'Исправленный комментарий'
+    comment.save()
+    assert comment.updated_at > updated_at
+    response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        'Убедитесь, что изменение комментария меняет ETag публикации.'
+    )
+    etag = response['ETag']
+    comment.delete()
+    assert revalidate(user_client, url, etag)[0].status_code == 200
+
+
+@pytest.mark.django_db
+def test_profile_revalidated_after_follow(user_client, another_user):
+    url = f'/profile/{another_user.username}/'
+    response = user_client.get(url)
+    assert 'private' in response['Cache-Control'], (
+        'Убедитесь, что страницы пользователя не сохраняются общими кешами.'
+    )
+    assert 'no-cache' in response['Cache-Control']
+    etag = response['ETag']
+    user_client.post(f'{url}follow/')
+    assert revalidate(user_client, url, etag)[0].status_code == 200, (
+        'Убедитесь, что подписка меняет ETag страницы профиля.'
+    )
+
+
+@pytest.mark.django_db
+def test_detail_private_for_user(user_client, post_with_published_location):
+    response = user_client.get(f'/posts/{post_with_published_location.id}/')
+    assert response['Cache-Control'] == 'private, no-cache'
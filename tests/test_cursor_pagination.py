@@ -0,0 +1,45 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from conftest import N_PER_PAGE
+
+
+@pytest.mark.django_db
+@override_settings(BLOG_CURSOR_PAGINATION=True)
+def test_cursor_pagination(
+        user_client, many_posts_with_published_locations
+):
+    posts = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True
+    )
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get('/')
+    assert not any(
+        'COUNT(*)' in query['sql'] and 'blog_post' in query['sql']
+        for query in queries.captured_queries
+    ), 'Убедитесь, что курсорная пагинация не считает количество постов.'
+    page = response.context['page_obj']
+    assert list(page) == posts[:N_PER_PAGE]
+    assert page.has_next() and not page.has_previous()
+
+    response = user_client.get(f'/?cursor={page.next_cursor}')
+    page = response.context['page_obj']
+    assert list(page) == posts[N_PER_PAGE:N_PER_PAGE * 2]
+    assert not page.has_next() and page.has_previous()
+
+    response = user_client.get(f'/?cursor={page.previous_cursor}')
+    page = response.context['page_obj']
+    assert list(page) == posts[:N_PER_PAGE]
+    assert not page.has_previous()
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_first_page(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get('/?cursor=garbage')
+    assert response.status_code == 200
+    assert len(response.context['page_obj']) == N_PER_PAGE
@@ -0,0 +1,102 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.views import COMMENTS_PER_PAGE
+
+
+def count_detail_queries(client, post):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/posts/{post.id}/')
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_detail_queries_do_not_depend_on_comments(
+        user_client, post_with_published_location, mixer
+):
+    post = post_with_published_location
+    mixer.blend('blog.Comment', post=post)
+    expected = count_detail_queries(user_client, post)
+    mixer.cycle(5).blend('blog.Comment', post=post)
+    assert count_detail_queries(user_client, post) == expected, (
+        'Убедитесь, что комментарии и их авторы загружаются на странице'
+        ' публикации одним запросом.'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ('client_fixture', 'expected'),
+    (
+        # post and comments
+        ('unlogged_client', 2),
+        # session and user, post and comments
+        ('user_client', 4),
+        ('another_user_client', 4),
+    )
+)
+def test_detail_queries_constant(
+        request, client_fixture, expected, post_with_published_location,
+        mixer
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    client = request.getfixturevalue(client_fixture)
+    assert count_detail_queries(client, post) == expected, (
+        'Убедитесь, что публикация загружается вместе с автором, категорией'
+        ' и местоположением одним запросом.'
+    )
+
+
+@pytest.mark.django_db
+def test_author_sees_own_unpublished_post(
+        user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    assert user_client.get(f'/posts/{post.id}/').status_code == 200
+    assert another_user_client.get(f'/posts/{post.id}/').status_code == 404
+
+
+@pytest.mark.django_db
+def test_comments_paginated(
+        user_client, post_with_published_location, mixer
+):
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        'blog.Comment', post=post
+    )
+    page = user_client.get(f'/posts/{post.id}/').context['comments']
+    assert list(page) == comments[:COMMENTS_PER_PAGE]
+    response = user_client.get(
+        f'/posts/{post.id}/comments/?cursor={page.next_cursor}'
+    )
+    assert list(response.context['comments']) == comments[COMMENTS_PER_PAGE:]
+    assert f'comment_{comments[-1].id}' in response.content.decode('utf-8')
+
+
+@pytest.mark.django_db
+def test_comments_pages_without_js(
+        user_client, post_with_published_location, mixer
+):
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTS_PER_PAGE + 5).blend(
+        'blog.Comment', post=post
+    )
+    page = user_client.get(f'/posts/{post.id}/').context['comments']
+    response = user_client.get(
+        f'/posts/{post.id}/', {'comments_cursor': page.next_cursor}
+    )
+    second = response.context['comments']
+    assert list(second) == comments[COMMENTS_PER_PAGE:]
+    assert (
+        f'?comments_cursor={second.previous_cursor}#comments'
+        in response.content.decode('utf-8')
+    ), 'Убедитесь, что со второй страницы комментариев можно вернуться.'
+    previous = user_client.get(
+        f'/posts/{post.id}/', {'comments_cursor': second.previous_cursor}
+    ).context['comments']
+    assert list(previous) == comments[:COMMENTS_PER_PAGE]
@@ -0,0 +1,94 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.django_db
+def test_export_posts_resumable(tmp_path, many_posts_with_published_locations):
+    posts = sorted(many_posts_with_published_locations, key=lambda p: p.id)
+    path = tmp_path / 'posts.jsonl.gz'
+    stderr = io.StringIO()
+    call_command(
+        'export_content', 'posts', output=str(path), after_id=0,
+        chunk_size=3, stderr=stderr
+    )
+    call_command(
+        'export_content', 'posts', output=str(path),
+        after_id=posts[4].id, chunk_size=3, stderr=stderr
+    )
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        rows = [json.loads(line) for line in file]
+    assert [row['id'] for row in rows] == [post.id for post in posts]
+    assert rows[0]['title'] == posts[0].title
+    assert f'последний id: {posts[-1].id}' in stderr.getvalue()
+
+
+@pytest.mark.django_db
+def test_export_comments_csv(tmp_path, comment_to_a_post):
+    path = tmp_path / 'comments.csv'
+    call_command(
+        'export_content', 'comments', output=str(path), format='csv',
+        stderr=io.StringIO()
+    )
+    with open(path, encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    assert rows[0]['text'] == comment_to_a_post.text
+    assert rows[0]['post_id'] == str(comment_to_a_post.post_id)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', ('posts.jsonl', 'posts.jsonl.gz'))
+def test_export_resumes_interrupted_file(
+        name, tmp_path, many_posts_with_published_locations
+):
+    posts = sorted(many_posts_with_published_locations, key=lambda p: p.id)
+    path = tmp_path / name
+    stderr = io.StringIO()
+    call_command(
+        'export_content', 'posts', output=str(path), chunk_size=3,
+        stderr=stderr
+    )
+    assert f'последний id: {posts[2].id}' in stderr.getvalue(), (
+        'Убедитесь, что выгрузка сообщает последний id после каждой порции.'
+    )
+    # An interrupted run: rows past the reported id and a partial line.
+    opener = gzip.open if name.endswith('.gz') else open
+    with opener(path, 'rb') as file:
+        data = file.read()
+    with opener(path, 'wb') as file:
+        file.write(data[:-10])
+    if name.endswith('.gz'):
+        with open(path, 'rb') as file:
+            data = file.read()
+        with open(path, 'wb') as file:
+            file.write(data[:-20])
+    call_command(
+        'export_content', 'posts', output=str(path),
+        after_id=posts[2].id, stderr=io.StringIO()
+    )
+    with gzip.open(path, 'rt') if name.endswith('.gz') else open(path) as file:
+        rows = [json.loads(line) for line in file]
+    assert [row['id'] for row in rows] == [post.id for post in posts], (
+        'Убедитесь, что при продолжении выгрузки незавершённая строка и'
+        ' строки после --after-id удаляются из файла.'
+    )
+
+
+@pytest.mark.django_db
+def test_export_refuses_gap(tmp_path, many_posts_with_published_locations):
+    posts = sorted(many_posts_with_published_locations, key=lambda p: p.id)
+    path = tmp_path / 'posts.jsonl'
+    call_command('export_content', 'posts', output=str(path))
+    with open(path, 'rb') as file:
+        lines = file.readlines()
+    with open(path, 'wb') as file:
+        file.writelines(lines[:2])
+    with pytest.raises(CommandError, match=f'--after-id {posts[1].id}'):
+        call_command(
+            'export_content', 'posts', output=str(path),
+            after_id=posts[4].id, stderr=io.StringIO()
+        )
@@ -0,0 +1,23 @@
+import pytest
+
+from blog.management.commands.explain_feeds import get_feed_querysets
+from conftest import N_PER_PAGE
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ('feed', 'index_name'),
+    (
+        ('index', 'post_published_pub_date_idx'),
+        ('category_posts', 'post_category_pub_date_idx'),
+        ('profile_view', 'post_author_pub_date_idx'),
+    )
+)
+def test_feed_uses_index(
+        feed, index_name, many_posts_with_published_locations
+):
+    posts = get_feed_querysets()[feed]
+    assert index_name in posts[:N_PER_PAGE].explain(), (
+        f'Убедитесь, что запрос ленты `{feed}` использует индекс'
+        f' `{index_name}`.'
+    )
@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('feed_type', ('rss', 'atom'))
+def test_feeds(client, posts, feed_type):
+    post = posts[0]
+    for url in (
+        f'/feeds/{feed_type}/',
+        f'/category/{post.category.slug}/{feed_type}/',
+        f'/profile/{post.author.username}/{feed_type}/',
+    ):
+        response = client.get(url)
+        assert response.status_code == 200, url
+        assert feed_type in response['Content-Type']
+        assert post.title in response.content.decode()
+        assert response['ETag'] and response['Last-Modified']
+
+
+@pytest.mark.django_db
+def test_feed_not_modified(client, posts, mixer):
+    response = client.get('/feeds/rss/')
+    etag = response['ETag']
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/feeds/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert not any(
+        '"blog_post"."text"' in query['sql']
+        for query in queries.captured_queries
+    ), 'Убедитесь, что ответ 304 не загружает публикации ленты.'
+
+    response = client.get(
+        '/feeds/rss/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    )
+    assert response.status_code == 304
+
+    mixer.blend('blog.Comment', post=posts[1])
+    response = client.get('/feeds/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304, (
+        'Убедитесь, что комментарии, которых нет в ленте, не меняют её ETag.'
+    )
+
+    posts[1].title = 'Исправленный заголовок'
+    posts[1].save()
+    response = client.get('/feeds/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200, (
+        'Убедитесь, что изменение публикации меняет ETag ленты.'
+    )
+    assert 'Исправленный заголовок' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_unknown_category_feed(client):
+    assert client.get('/category/missing/rss/').status_code == 404
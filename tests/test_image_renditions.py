@@ -0,0 +1,134 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.utils import override_settings
+from PIL import Image, ImageCms
+
+from blog.forms import PostForm
+from blog.images import get_rendition_name, make_renditions
+
+
+def make_upload(size, name='photo.jpg'):
+    data = BytesIO()
+    Image.new('RGB', size).save(data, 'JPEG')
+    return SimpleUploadedFile(name, data.getvalue(), content_type='image/jpeg')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_renditions_made_on_post_save(
+        media_root, user_client, published_category
+):
+    response = user_client.post('/posts/create/', data={
+        'title': 'Заголовок', 'text': 'Текст', 'pub_date': '2020-01-01 00:00',
+        'is_published': True,
+        'category': published_category.id, 'image': make_upload((2000, 1000))
+    })
+    assert response.status_code == 302
+    post = published_category.posts.get()
+    assert post.image_renditions == '320,640,1280'
+    for width in (320, 640, 1280):
+        for image_format in ('webp', 'jpeg'):
+            name = get_rendition_name(post.image.name, width, image_format)
+            with default_storage.open(name) as file:
+                assert Image.open(file).width == width
+    content = user_client.get('/').content.decode('utf-8')
+    rendition = get_rendition_name(post.image.name, 640, 'webp')
+    assert f'{rendition} 640w' in content, (
+        'Убедитесь, что в ленте у фото публикации указан srcset миниатюр.'
+    )
+
+
+@pytest.mark.django_db
+def test_small_image_not_upscaled(media_root):
+    name = default_storage.save('posts/small.jpg', make_upload((500, 300)))
+    assert make_renditions(name) == [320, 500]
+
+
+def clean_upload(upload, category):
+    with override_settings(BLOG_IMAGE_MAX_DIMENSION=1000):
+        form = PostForm(
+            data={
+                'title': 'Заголовок', 'text': 'Текст',
+                'pub_date': '2020-01-01 00:00',
+                'category': category.id,
+            },
+            files={'image': upload}
+        )
+        assert form.is_valid(), form.errors
+    return form.cleaned_data['image']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('image_format', ('JPEG', 'PNG', 'WEBP'))
+def test_upload_downscaled_and_stripped(
+        media_root, published_category, image_format
+):
+    data = BytesIO()
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera maker'
+    Image.new('RGB', (4000, 1000)).save(data, image_format, exif=exif)
+    upload = SimpleUploadedFile(f'big.{image_format.lower()}', data.getvalue())
+    image = Image.open(clean_upload(upload, published_category))
+    assert image.format == image_format
+    assert image.size == (1000, 250)
+    assert not image.getexif() and 'exif' not in image.info, (
+        f'Убедитесь, что из фото {image_format} удаляются метаданные EXIF.'
+    )
+
+
+@pytest.mark.django_db
+def test_upload_cmyk_converted(media_root, published_category):
+    data = BytesIO()
+    Image.new('CMYK', (100, 50)).save(data, 'TIFF')
+    upload = SimpleUploadedFile('scan.tiff', data.getvalue())
+    image = Image.open(clean_upload(upload, published_category))
+    assert (image.format, image.mode) == ('PNG', 'RGB'), (
+        'Убедитесь, что фото в CMYK преобразуется и сохраняется в PNG.'
+    )
+
+
+@pytest.mark.django_db
+def test_upload_too_large_rejected(media_root, published_category):
+    with override_settings(BLOG_IMAGE_MAX_UPLOAD_SIZE=100):
+        form = PostForm(
+            data={}, files={'image': make_upload((200, 200))}
+        )
+        assert not form.is_valid()
+    assert 'image' in form.errors
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('image_format', ('JPEG', 'PNG', 'WEBP'))
+def test_upload_keeps_color_profile(
+        media_root, published_category, image_format
+):
+    profile = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB'))
+    data = BytesIO()
+    Image.new('RGB', (2000, 1000)).save(
+        data, image_format, icc_profile=profile.tobytes()
+    )
+    upload = SimpleUploadedFile(f'big.{image_format.lower()}', data.getvalue())
+    image = Image.open(clean_upload(upload, published_category))
+    assert image.info.get('icc_profile') == profile.tobytes(), (
+        f'Убедитесь, что у фото {image_format} сохраняется цветовой профиль.'
+    )
+
+
+@pytest.mark.django_db
+def test_decompression_bomb_rejected(
+        media_root, published_category, monkeypatch
+):
+    # Over the limit but under twice it: Pillow only warns.
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 100 * 100)
+    form = PostForm(
+        data={
+            'title': 'Заголовок', 'text': 'Текст',
+            'pub_date': '2020-01-01 00:00', 'category': published_category.id,
+        },
+        files={'image': make_upload((150, 100))}
+    )
+    assert not form.is_valid() and 'image' in form.errors, (
+        'Убедитесь, что фото больше Image.MAX_IMAGE_PIXELS отклоняются.'
+    )
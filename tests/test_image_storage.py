@@ -0,0 +1,86 @@
+import pytest
+
+from blog.models import ImageLock, Post
+from blog.storage import post_image_storage
+
+
+@pytest.mark.django_db
+def test_same_image_stored_once(
+        media_root, make_image, mixer, user, another_user,
+        published_category, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        first, second = (
+            mixer.blend(
+                'blog.Post', author=author, category=published_category,
+                image=make_image(name, 'red')
+            )
+            for author, name in ((user, 'a.png'), (another_user, 'b.png'))
+        )
+    assert first.image.name == second.image.name
+    assert post_image_storage.exists(first.image.name)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert post_image_storage.exists(second.image.name), (
+        'Убедитесь, что фото не удаляется, пока на него ссылаются публикации.'
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        another_user.delete()
+    assert not post_image_storage.exists(second.image.name), (
+        'Убедитесь, что фото удаляется вместе с последней публикацией.'
+    )
+
+
+@pytest.mark.django_db
+def test_replaced_image_released(
+        media_root, make_image, mixer, published_category,
+        django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        post = mixer.blend(
+            'blog.Post', category=published_category,
+            image=make_image('a.png', 'red')
+        )
+    old_name = post.image.name
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = make_image('a.png', 'blue')
+        post.save()
+    assert post.image.name != old_name
+    assert not post_image_storage.exists(old_name)
+
+
+@pytest.mark.django_db
+def test_image_released_before_twin_commit_restored(
+        media_root, make_image, mixer, user, another_user,
+        published_category, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        first = mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            image=make_image('a.png', 'red')
+        )
+    name = first.image.name
+    with django_capture_on_commit_callbacks() as callbacks:
+        second = mixer.blend(
+            'blog.Post', author=another_user, category=published_category,
+            image=make_image('b.png', 'red')
+        )
+    assert second.image.name == name
+    # The release sees no reference, the twin is not committed yet.
+    Post.objects.filter(id=second.id).update(image='')
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert not post_image_storage.exists(name)
+    Post.objects.filter(id=second.id).update(image=name)
+    for callback in callbacks:
+        callback()
+    assert post_image_storage.exists(name), (
+        'Убедитесь, что фото, удалённое до фиксации публикации с тем же'
+        ' содержимым, записывается снова.'
+    )
+    assert not ImageLock.objects.exists(), (
+        'Убедитесь, что блокировки фото удаляются после освобождения и'
+        ' записи фото.'
+    )
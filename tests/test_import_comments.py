@@ -0,0 +1,31 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from blog.models import Comment
+
+
+@pytest.mark.django_db
+def test_import_comments(tmp_path, user, post_with_published_location):
+    post = post_with_published_location
+    lines = [
+        {'post': post.id, 'author': user.id, 'text': f'Комментарий {i}'}
+        for i in range(5)
+    ] + [
+        {'post': post.id, 'author': user.id, 'text': ''},
+        {'post': post.id + 100, 'author': user.id, 'text': 'Нет поста'},
+        {'post': post.id},
+    ]
+    path = tmp_path / 'comments.jsonl'
+    path.write_text('\n'.join(json.dumps(line) for line in lines) + '\nnot json\n')
+    stderr = StringIO()
+    call_command(
+        'import_comments', str(path), batch_size=2,
+        stdout=StringIO(), stderr=stderr
+    )
+    assert Comment.objects.filter(post=post).count() == 5
+    post.refresh_from_db()
+    assert post.comment_count == 5
+    assert len(stderr.getvalue().splitlines()) == 4
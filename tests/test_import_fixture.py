@@ -0,0 +1,93 @@
+import gzip
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+
+from blog.caching import NEXT_PUBLICATION_KEY
+from blog.management.commands.import_fixture import iter_json_array
+from blog.models import Category, Comment, Location, Post
+
+DB_JSON = Path(__file__).resolve().parent.parent / 'db.json'
+
+
+def test_iter_json_array_small_chunks():
+    items = [{'a': i, 'text': 'x, ] [' * i} for i in range(20)]
+    file = io.StringIO(json.dumps(items, indent=2))
+    assert list(iter_json_array(file, chunk_size=7)) == items
+
+
+@pytest.mark.parametrize(
+    'text', ('[{"a": 1}, 2]', '[{"a": 1}, [{"b": 2}]]', '[{"a": 1}, "x"]')
+)
+def test_iter_json_array_rejects_non_objects(text):
+    with pytest.raises(ValueError, match='Ожидается объект'):
+        list(iter_json_array(io.StringIO(text)))
+
+
+def test_iter_json_array_buffer_capped():
+    file = io.StringIO('[{"a": 1}, {"b": ' + 'x' * 1000 + ']')
+    with pytest.raises(ValueError, match='длиннее 100'):
+        list(iter_json_array(file, chunk_size=10, max_buffer=100))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('text', ('[1]', '[{"pk": 1}]', '[{"model": 1}]'))
+def test_import_malformed_items(text, tmp_path):
+    path = tmp_path / 'db.json'
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(CommandError):
+        call_command('import_fixture', str(path), stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+def test_import_db_json(tmp_path):
+    cache.set(NEXT_PUBLICATION_KEY, 0)
+    path = tmp_path / 'db.json.gz'
+    path.write_bytes(gzip.compress(DB_JSON.read_bytes()))
+    call_command('import_fixture', str(path), batch_size=5, stdout=io.StringIO())
+    fixture = json.loads(DB_JSON.read_text(encoding='utf-8'))
+    for model in (Category, Location, Post):
+        label = model._meta.label_lower
+        assert model.objects.count() == sum(
+            1 for item in fixture if item['model'] == label
+        )
+    post = Post.objects.get(pk=1)
+    assert post.author_id == 3 and post.category_id == 4
+    assert not Comment.objects.exists()
+    assert cache.get(NEXT_PUBLICATION_KEY) is None, (
+        'Убедитесь, что после импорта сбрасывается время ближайшей'
+        ' отложенной публикации.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_parents_after_children(tmp_path):
+    fixture = json.loads(DB_JSON.read_text(encoding='utf-8'))
+    path = tmp_path / 'db.json'
+    path.write_text(json.dumps(sorted(
+        fixture, key=lambda item: item['model'] != 'blog.post'
+    )), encoding='utf-8')
+    call_command('import_fixture', str(path), batch_size=5, stdout=io.StringIO())
+    assert Post.objects.count() == sum(
+        1 for item in fixture if item['model'] == 'blog.post'
+    ), 'Публикации перед авторами в файле должны загружаться.'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_missing_parent_rolled_back(tmp_path):
+    fixture = json.loads(DB_JSON.read_text(encoding='utf-8'))
+    path = tmp_path / 'db.json'
+    path.write_text(json.dumps(
+        [item for item in fixture if item['model'] != 'auth.user']
+    ), encoding='utf-8')
+    with pytest.raises(CommandError):
+        call_command(
+            'import_fixture', str(path), batch_size=5, stdout=io.StringIO()
+        )
+    assert not Post.objects.exists(), (
+        'При нарушении целостности импорт должен откатываться целиком.'
+    )
@@ -0,0 +1,61 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.caching import get_cache_timeout
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_cached(client, post_with_published_location, mixer):
+    post = post_with_published_location
+    client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/')
+    assert len(queries) == 0, (
+        'Убедитесь, что главная страница для анонимных пользователей'
+        ' отдаётся из кэша.'
+    )
+    assert post.title in response.content.decode('utf-8')
+
+    new_post = mixer.blend(
+        'blog.Post', category=post.category, location=post.location,
+        is_published=True, pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    response = client.get('/')
+    assert new_post.title in response.content.decode('utf-8'), (
+        'Убедитесь, что кэш страницы сбрасывается при добавлении поста.'
+    )
+
+
+@pytest.mark.django_db
+def test_page_cache_expires_with_delayed_post(
+        post_with_published_location, mixer
+):
+    post = post_with_published_location
+    mixer.blend(
+        'blog.Post', category=post.category, is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=30)
+    )
+    assert get_cache_timeout(settings.BLOG_PAGE_CACHE_TIMEOUT) <= 30
+
+
+@pytest.mark.django_db
+def test_cache_headers_capped_by_delayed_post(
+        client, post_with_published_location, mixer
+):
+    post = post_with_published_location
+    client.get('/')
+    mixer.blend(
+        'blog.Post', category=post.category, is_published=True,
+        pub_date=timezone.now() + timedelta(seconds=30)
+    )
+    response = client.get('/')
+    max_age = int(response['Cache-Control'].split('max-age=')[1])
+    assert 0 < max_age <= 30, (
+        'Убедитесь, что время кэширования страницы не превышает времени'
+        ' до ближайшей отложенной публикации.'
+    )
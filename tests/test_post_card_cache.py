@@ -0,0 +1,65 @@
+import pytest
+
+from blog.caching import VERSION_KEY, get_versions, render_post_cards
+
+
+@pytest.mark.django_db
+def test_post_card_reused(post_with_published_location, monkeypatch):
+    post = post_with_published_location
+    first = render_post_cards([post])
+    monkeypatch.setattr(
+        'blog.caching.render_to_string',
+        lambda *args, **kwargs: pytest.fail('Карточка не взята из кэша.')
+    )
+    assert render_post_cards([post]) == first
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('attr', ('post', 'category', 'location', 'author'))
+def test_post_card_invalidated(attr, post_with_published_location, mixer):
+    post = post_with_published_location
+    render_post_cards([post])
+    obj = post if attr == 'post' else getattr(post, attr)
+    if attr == 'author':
+        obj.username = 'renamed_author'
+        expected = obj.username
+    elif attr == 'location':
+        obj.name = 'Новое место'
+        expected = obj.name
+    else:
+        obj.title = f'Новый заголовок {attr}'
+        expected = obj.title
+    obj.save()
+    assert expected in render_post_cards([post])[0], (
+        f'Убедитесь, что карточка публикации обновляется'
+        f' при изменении `{attr}`.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_invalidated_by_comment(
+        post_with_published_location, mixer
+):
+    post = post_with_published_location
+    render_post_cards([post])
+    mixer.blend('blog.Comment', post=post)
+    post.refresh_from_db()
+    assert 'Комментарии (1)' in render_post_cards([post])[0]
+
+
+@pytest.mark.django_db
+def test_post_version_bumped_after_commit(
+        post_with_published_location, django_capture_on_commit_callbacks
+):
+    post = post_with_published_location
+    key = VERSION_KEY.format('post', post.id)
+    with django_capture_on_commit_callbacks() as callbacks:
+        post.title = 'Новый заголовок'
+        post.save()
+    # A concurrent request may cache old rows under this version.
+    version = get_versions([key])[key]
+    for callback in callbacks:
+        callback()
+    assert get_versions([key])[key] != version, (
+        'Убедитесь, что версии кэша повышаются и после фиксации транзакции.'
+    )
@@ -0,0 +1,126 @@
+import base64
+import json
+from unittest import mock
+from urllib.parse import urlencode
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import SearchBackend, SQLiteSearchBackend, get_search_backend
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make_post(title, text='', is_published=True):
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            location=None, title=title, text=text, is_published=is_published,
+            pub_date=timezone.now()
+        )
+    return make_post
+
+
+def search(client, query, cursor=None):
+    data = {'q': query}
+    if cursor:
+        data['cursor'] = cursor
+    response = client.get('/search/', data)
+    assert response.status_code == 200
+    return response.context['page_obj']
+
+
+@pytest.mark.django_db
+def test_search_ranked_and_visible(client, make_post):
+    in_text = make_post('Про погоду', 'Сегодня видели ёжика в лесу')
+    in_title = make_post('Ежик в тумане', 'Мультфильм')
+    make_post('Ежик', is_published=False)
+    make_post('Про кошек', 'Ничего общего')
+
+    assert list(search(client, 'ёжик')) == [in_title], (
+        'Убедитесь, что поиск учитывает только целые слова и ё.'
+    )
+    assert list(search(client, 'ежика')) == [in_text]
+    make_post('Ежика нашли', 'ежика ежика')
+    assert list(search(client, 'ежика'))[-1] == in_text, (
+        'Убедитесь, что результаты упорядочены по релевантности.'
+    )
+    assert not list(search(client, ''))
+    assert not list(search(client, '"AND (')), (
+        'Убедитесь, что служебные символы запроса не ломают поиск.'
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_synced(client, make_post):
+    post = make_post('Старый заголовок')
+    post.title = 'Новый заголовок'
+    post.save()
+    assert not list(search(client, 'старый'))
+    assert list(search(client, 'новый')) == [post]
+    with CaptureQueriesContext(connection) as queries:
+        post.is_published = True
+        post.save()
+    assert not any(
+        'blog_post_fts' in query['sql'] for query in queries.captured_queries
+    ), 'Убедитесь, что индекс не перезаписывается без правки текста.'
+    post.delete()
+    assert not list(search(client, 'новый'))
+
+    Post.objects.bulk_create([Post(
+        title='Массовая загрузка', text='', author=post.author,
+        category=post.category, pub_date=post.pub_date
+    )])
+    call_command('rebuild_search_index', stdout=None)
+    assert len(search(client, 'массовая')) == 1
+
+
+@pytest.mark.django_db
+def test_search_cursor_pagination(client, make_post):
+    posts = [make_post(f'Пост {index}', 'слово ' * index)
+             for index in range(1, 16)]
+    first = search(client, 'слово')
+    second = search(client, 'слово', first.next_cursor)
+    assert len(first) == 10 and len(second) == 5
+    assert set(first) | set(second) == set(posts)
+    assert not second.has_next()
+    assert list(search(client, 'слово', second.previous_cursor)) == list(
+        first
+    )
+
+
+@pytest.mark.django_db
+def test_search_page_links_keep_query(client, make_post):
+    for index in range(1, 12):
+        make_post(f'Пост {index}', 'слово и дело')
+    response = client.get('/search/', {'q': 'слово дело'})
+    link = '?{}&cursor={}'.format(
+        urlencode({'q': 'слово дело'}),
+        response.context['page_obj'].next_cursor
+    )
+    assert link in response.content.decode('utf-8'), (
+        'Убедитесь, что ссылки на страницы поиска сохраняют запрос.'
+    )
+
+
+def test_search_backend_by_vendor(settings):
+    settings.BLOG_SEARCH_BACKEND = None
+    with mock.patch.object(connection, 'vendor', 'postgresql'):
+        assert type(get_search_backend()) is SearchBackend
+    with mock.patch.object(connection, 'vendor', 'sqlite'):
+        assert type(get_search_backend()) is SQLiteSearchBackend
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('rank', ([1], {'a': 1}, 'не число'))
+def test_search_crafted_cursor_ignored(client, make_post, rank):
+    make_post('Пост', 'слово')
+    cursor = base64.urlsafe_b64encode(
+        json.dumps(['n', rank, 5]).encode()
+    ).decode()
+    assert len(search(client, 'слово', cursor)) == 1, (
+        'Убедитесь, что неверный курсор поиска возвращает первую страницу.'
+    )
@@ -0,0 +1,103 @@
+import gzip
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import Http404
+from django.test.utils import override_settings
+
+from blog.images import get_rendition_name
+from blogicum.serving import get_cache_control, serve
+
+CSS = 'body { color: red; }\n' * 100
+
+
+@pytest.fixture
+def static_root(tmp_path):
+    source = tmp_path / 'source'
+    (source / 'css').mkdir(parents=True)
+    (source / 'css' / 'site.css').write_text(CSS)
+    with override_settings(
+        STATIC_ROOT=tmp_path / 'static',
+        STATICFILES_DIRS=[source],
+        STATICFILES_STORAGE=(
+            'blogicum.serving.CompressedManifestStaticFilesStorage'
+        ),
+    ):
+        call_command('collectstatic', interactive=False, verbosity=0)
+        yield tmp_path / 'static'
+
+
+def test_static_hashed_and_precompressed(static_root, rf):
+    name = staticfiles_storage.stored_name('css/site.css')
+    assert name != 'css/site.css', (
+        'Убедитесь, что статика сохраняется с хешем в имени.'
+    )
+    assert gzip.decompress(
+        (static_root / f'{name}.gz').read_bytes()
+    ).decode() == CSS
+
+    response = serve(
+        rf.get('/', HTTP_ACCEPT_ENCODING='gzip, deflate'), name, static_root
+    )
+    assert response['Content-Encoding'] == 'gzip'
+    assert response['Content-Type'].startswith('text/css')
+    assert 'immutable' in response['Cache-Control']
+    assert 'Accept-Encoding' in response['Vary']
+    assert gzip.decompress(b''.join(response.streaming_content)).decode() == (
+        CSS
+    )
+
+    response = serve(rf.get('/'), name, static_root)
+    assert 'Content-Encoding' not in response
+    assert b''.join(response.streaming_content).decode() == CSS
+
+
+def test_media_validators_and_ranges(tmp_path, rf):
+    (tmp_path / 'posts').mkdir()
+    (tmp_path / 'posts' / 'a.jpg').write_bytes(b'0123456789')
+
+    response = serve(rf.get('/'), 'posts/a.jpg', tmp_path)
+    assert response.status_code == 200
+    assert response['Content-Length'] == '10'
+    etag = response['ETag']
+
+    response = serve(rf.get('/', HTTP_IF_NONE_MATCH=etag), 'posts/a.jpg',
+                     tmp_path)
+    assert response.status_code == 304, (
+        'Убедитесь, что при совпадении ETag возвращается 304.'
+    )
+
+    response = serve(rf.get('/', HTTP_RANGE='bytes=2-5'), 'posts/a.jpg',
+                     tmp_path)
+    assert response.status_code == 206
+    assert response['Content-Range'] == 'bytes 2-5/10'
+    assert b''.join(response.streaming_content) == b'2345'
+
+    response = serve(rf.get('/', HTTP_RANGE='bytes=-3'), 'posts/a.jpg',
+                     tmp_path)
+    assert b''.join(response.streaming_content) == b'789'
+
+    response = serve(rf.get('/', HTTP_RANGE='bytes=20-'), 'posts/a.jpg',
+                     tmp_path)
+    assert response.status_code == 416
+
+    response = serve(
+        rf.get('/', HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"stale"'),
+        'posts/a.jpg', tmp_path
+    )
+    assert response.status_code == 200
+
+    with pytest.raises(Http404):
+        serve(rf.get('/'), '../a.jpg', tmp_path / 'posts')
+
+
+@pytest.mark.parametrize(
+    ('width', 'image_format'), ((320, 'webp'), (960, 'jpeg'))
+)
+def test_renditions_immutable(width, image_format):
+    name = get_rendition_name(f'posts/{"a" * 64}.png', width, image_format)
+    assert 'immutable' in get_cache_control(name), (
+        'Убедитесь, что миниатюры фото отдаются с immutable, как и само фото.'
+    )
+    assert 'immutable' not in get_cache_control('posts/a.png_320.webp')
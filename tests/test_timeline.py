@@ -0,0 +1,145 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Follow, TimelineEntry
+from blog.timelines import backfill
+
+
+@pytest.fixture
+def make_post(mixer, another_user, published_category):
+    def make_post(**kwargs):
+        values = {
+            'author': another_user,
+            'category': published_category,
+            'location': None,
+            'is_published': True,
+            'pub_date': timezone.now() - timedelta(hours=1),
+        }
+        values.update(kwargs)
+        return mixer.blend('blog.Post', **values)
+    return make_post
+
+
+def get_timeline(client, cursor=None):
+    response = client.get('/feed/', {'cursor': cursor} if cursor else {})
+    assert response.status_code == 200
+    return response.context['page_obj']
+
+
+@pytest.mark.django_db
+def test_follow_fills_timeline(user_client, another_user, make_post):
+    old_post = make_post()
+    make_post(is_published=False)
+    user_client.post(f'/profile/{another_user.username}/follow/')
+    assert list(get_timeline(user_client)) == [old_post], (
+        'Убедитесь, что при подписке в ленту добавляются публикации автора.'
+    )
+
+    new_post = make_post(pub_date=timezone.now() - timedelta(minutes=1))
+    scheduled = make_post(pub_date=timezone.now() + timedelta(days=1))
+    assert list(get_timeline(user_client)) == [new_post, old_post], (
+        'Убедитесь, что новые публикации попадают в ленту подписчиков,'
+        ' а отложенные появляются в ней только после даты публикации.'
+    )
+    assert TimelineEntry.objects.filter(post=scheduled).exists()
+
+    new_post.is_published = False
+    new_post.save()
+    assert list(get_timeline(user_client)) == [old_post]
+
+    user_client.post(f'/profile/{another_user.username}/unfollow/')
+    assert not TimelineEntry.objects.exists(), (
+        'Убедитесь, что после отписки лента очищается от публикаций автора.'
+    )
+
+
+@pytest.mark.django_db
+def test_timeline_paginated(
+        user_client, user, another_user, make_post
+):
+    Follow.objects.create(user=user, author=another_user)
+    posts = [
+        make_post(pub_date=timezone.now() - timedelta(hours=index))
+        for index in range(1, 13)
+    ]
+    first = get_timeline(user_client)
+    assert list(first) == posts[:10]
+    assert list(get_timeline(user_client, first.next_cursor)) == posts[10:]
+
+
+@pytest.mark.django_db
+def test_timeline_jobs(user, another_user, make_post):
+    posts = [
+        make_post(pub_date=timezone.now() - timedelta(hours=index))
+        for index in range(1, 4)
+    ]
+    TimelineEntry.objects.bulk_create([
+        TimelineEntry(user=user, post=post, pub_date=post.pub_date)
+        for post in posts
+    ])
+    call_command('prune_timelines', stdout=StringIO())
+    assert not TimelineEntry.objects.exists(), (
+        'Убедитесь, что задача очистки удаляет записи без подписки.'
+    )
+
+    Follow.objects.bulk_create([Follow(user=user, author=another_user)])
+    call_command('backfill_timelines', stdout=StringIO())
+    assert TimelineEntry.objects.filter(user=user).count() == 3
+    call_command('prune_timelines', '--keep=2', stdout=StringIO())
+    assert list(
+        TimelineEntry.objects.filter(user=user)
+        .order_by('-pub_date').values_list('post', flat=True)
+    ) == [post.id for post in posts[:2]]
+
+
+@pytest.mark.django_db
+def test_backfill_counts_added_entries(user, another_user, make_post):
+    make_post()
+    make_post()
+    Follow.objects.bulk_create([Follow(user=user, author=another_user)])
+    assert backfill(user.id, another_user.id) == 2
+    assert backfill(user.id, another_user.id) == 0, (
+        'Убедитесь, что уже добавленные записи ленты не считаются повторно.'
+    )
+
+
+@pytest.mark.django_db
+def test_author_change_moves_post_between_timelines(
+        user, another_user, mixer, make_post
+):
+    post = make_post()
+    Follow.objects.create(user=user, author=another_user)
+    new_author = mixer.blend('auth.User')
+    post.author = new_author
+    post.save()
+    assert not TimelineEntry.objects.filter(user=user).exists(), (
+        'Убедитесь, что при смене автора публикация пропадает из лент'
+        ' подписчиков прежнего автора.'
+    )
+    Follow.objects.create(user=another_user, author=new_author)
+    post.save()
+    assert TimelineEntry.objects.filter(
+        user=another_user, post=post
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_text_edit_not_fanned_out(user, another_user, make_post):
+    Follow.objects.create(user=user, author=another_user)
+    post = make_post()
+    post.title = 'Исправленный заголовок'
+    with CaptureQueriesContext(connection) as queries:
+        post.save()
+    assert not any(
+        'blog_timelineentry' in query['sql']
+        for query in queries.captured_queries
+    ), 'Убедитесь, что правка текста не переписывает ленты подписчиков.'
+    post.is_published = False
+    post.save()
+    assert not TimelineEntry.objects.exists()